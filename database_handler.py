@@ -9,6 +9,9 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows fetched from SQLite per round trip when loading a whole table
+READ_CHUNK_ROWS = 50_000
+
 class DatabaseHandler:
     def __init__(self, db_path: str):
         self.db_path = db_path
@@ -60,6 +63,11 @@ class DatabaseHandler:
             })
         return schema
     
+    def _read_query(self, query: str) -> pd.DataFrame:
+        """Run a query into a DataFrame, fetching rows in bounded chunks"""
+        chunks = pd.read_sql_query(query, self.connection, chunksize=READ_CHUNK_ROWS)
+        return pd.concat(chunks, ignore_index=True)
+    
     def get_all_novels(self) -> pd.DataFrame:
         """Get all novels from the database"""
         if not self.connection:
@@ -70,7 +78,7 @@ class DatabaseHandler:
         
         for table in possible_tables:
             try:
-                df = pd.read_sql_query(f"SELECT * FROM {table}", self.connection)
+                df = self._read_query(f"SELECT * FROM {table}")
                 logger.info(f"Found novels in table: {table}")
                 return df
             except:
@@ -100,7 +108,7 @@ class DatabaseHandler:
                 WHERE c.content IS NOT NULL AND c.content != ''
                 ORDER BY c.novel_id, c.id
                 """
-                df = pd.read_sql_query(query, self.connection)
+                df = self._read_query(query)
                 logger.info(f"Found chapters data in combined query")
                 return df
         except Exception as e:
@@ -110,7 +118,7 @@ class DatabaseHandler:
         tables = self.get_tables()
         if tables:
             try:
-                df = pd.read_sql_query(f"SELECT * FROM {tables[0]}", self.connection)
+                df = self._read_query(f"SELECT * FROM {tables[0]}")
                 logger.info(f"Using table: {tables[0]}")
                 return df
             except Exception as e:
@@ -198,7 +206,9 @@ class CSVHandler:
     def load_csv(file_path: str) -> pd.DataFrame:
         """Load fanfiction data from CSV file"""
         try:
-            df = pd.read_csv(file_path)
+            # Multi-threaded Arrow parser; text stays in Arrow string arrays
+            # instead of one Python str object per cell
+            df = pd.read_csv(file_path, engine='pyarrow', dtype_backend='pyarrow')
             logger.info(f"Loaded {len(df)} records from CSV: {file_path}")
             return df
         except Exception as e:
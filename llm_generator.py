@@ -1,19 +1,45 @@
 import openai
 import anthropic
 import requests
-from typing import List, Dict, Any, Optional
+import httpx
+import asyncio
+import orjson
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 import json
 import random
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from config import Config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Chapter prompts in flight at once for a single story
+CHAPTER_CONCURRENCY = 8
+
+_async_http_client: Optional[httpx.AsyncClient] = None
+
+def create_async_http_client() -> httpx.AsyncClient:
+    """Create a keep-alive HTTP client for LLM backend calls"""
+    return httpx.AsyncClient(
+        timeout=120,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32)
+    )
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Fallback shared client for generators not handed one by the app"""
+    global _async_http_client
+    if _async_http_client is None or _async_http_client.is_closed:
+        _async_http_client = create_async_http_client()
+    return _async_http_client
+
 class LLMGenerator:
-    def __init__(self, model_type: str = "openai", model_name: str = None):
+    def __init__(self, model_type: str = "openai", model_name: str = None,
+                 http_client: Optional[httpx.AsyncClient] = None):
         self.model_type = model_type
         self.model_name = model_name or Config.DEFAULT_MODEL
+        self.http_client = http_client
         
         if model_type == "openai":
             if not Config.OPENAI_API_KEY:
@@ -108,24 +134,108 @@ class LLMGenerator:
         except Exception as e:
             logger.error(f"Error generating text: {e}")
             return self._mock_response(prompt)
-    
-    def _generate_ollama(self, prompt: str, max_tokens: int, temperature: float) -> str:
-        """Generate text using Ollama"""
+
+    def generate_batch(self, prompts: List[str], max_tokens: int = None, temperature: float = None) -> List[str]:
+        """Generate text for several prompts at once, preserving prompt order"""
+        if len(prompts) <= 1 or not self.client:
+            return [self.generate_text(prompt, max_tokens, temperature) for prompt in prompts]
+
+        # The backends batch concurrent requests server-side, so keep them all in flight
+        with ThreadPoolExecutor(max_workers=len(prompts)) as executor:
+            return list(executor.map(lambda p: self.generate_text(p, max_tokens, temperature), prompts))
+
+    async def generate_text_async(self, prompt: str, max_tokens: int = None, temperature: float = None) -> str:
+        """Generate text without blocking the event loop"""
+        max_tokens = max_tokens or Config.MAX_TOKENS
+        temperature = temperature or Config.TEMPERATURE
+        
+        if not self.client:
+            return self._mock_response(prompt)
+        
+        if self.model_type == "ollama":
+            return await self._generate_ollama_async(prompt, max_tokens, temperature)
+        
+        # The OpenAI/Anthropic SDK clients are synchronous; run them in a worker thread
+        return await asyncio.to_thread(self.generate_text, prompt, max_tokens, temperature)
+
+    async def stream_text(self, prompt: str, max_tokens: int = None, temperature: float = None) -> AsyncIterator[str]:
+        """Yield generated text as it arrives; non-streaming backends yield it whole"""
+        max_tokens = max_tokens or Config.MAX_TOKENS
+        temperature = temperature or Config.TEMPERATURE
+        
+        if self.client and self.model_type == "ollama":
+            async for token in self._stream_ollama(prompt, max_tokens, temperature):
+                yield token
+        else:
+            yield await self.generate_text_async(prompt, max_tokens, temperature)
+
+    async def _stream_ollama(self, prompt: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        """Stream tokens from Ollama's NDJSON /api/generate response"""
+        streamed = False
         try:
-            payload = {
-                "model": self.model_name,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens,
-                    "top_p": Config.TOP_P
-                }
+            async with (self.http_client or get_async_http_client()).stream(
+                "POST",
+                f"{self.ollama_url}/api/generate",
+                json=self._ollama_payload(prompt, max_tokens, temperature, stream=True)
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+                else:
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        chunk = orjson.loads(line)
+                        if chunk.get('response'):
+                            streamed = True
+                            yield chunk['response']
+                        if chunk.get('done'):
+                            break
+                    
+        except Exception as e:
+            logger.error(f"Error streaming from Ollama API: {e}")
+        
+        if not streamed:
+            yield self._mock_response(prompt)
+
+    def _ollama_payload(self, prompt: str, max_tokens: int, temperature: float,
+                        stream: bool = False) -> Dict[str, Any]:
+        """Build the /api/generate request body"""
+        return {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens,
+                "top_p": Config.TOP_P
             }
+        }
+
+    async def _generate_ollama_async(self, prompt: str, max_tokens: int, temperature: float) -> str:
+        """Generate text using Ollama over the shared async client"""
+        try:
+            response = await (self.http_client or get_async_http_client()).post(
+                f"{self.ollama_url}/api/generate",
+                json=self._ollama_payload(prompt, max_tokens, temperature)
+            )
             
+            if response.status_code == 200:
+                return response.json().get('response', '').strip()
+            else:
+                logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+                return self._mock_response(prompt)
+                
+        except Exception as e:
+            logger.error(f"Error calling Ollama API: {e}")
+            return self._mock_response(prompt)
+
+    def _generate_ollama(self, prompt: str, max_tokens: int, temperature: float) -> str:
+        """Generate text using Ollama"""
+        try:
             response = requests.post(
                 f"{self.ollama_url}/api/generate",
-                json=payload,
+                json=self._ollama_payload(prompt, max_tokens, temperature),
                 timeout=120  # 2 minutes timeout
             )
             
@@ -161,6 +271,10 @@ class FanfictionGenerator:
         prompt = self._create_outline_prompt(parameters)
         outline_text = self.llm.generate_text(prompt, max_tokens=1000)
         
+        return self._build_outline(outline_text, parameters)
+    
+    def _build_outline(self, outline_text: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Wrap generated outline text with its parameters"""
         return {
             'outline': outline_text,
             'parameters': parameters,
@@ -181,8 +295,7 @@ class FanfictionGenerator:
         outline = self.generate_story_outline(parameters)
         
         # Determine number of chapters
-        target_length = parameters.get('target_length', 5000)
-        chapter_count = max(1, target_length // Config.MAX_CHAPTER_LENGTH)
+        chapter_count = self._chapter_count(parameters)
         
         # Generate chapters
         chapters = []
@@ -195,6 +308,94 @@ class FanfictionGenerator:
         title = self.generate_title(outline, chapters)
         summary = self.generate_summary(outline, chapters)
         
+        return self._assemble_story(title, summary, outline, chapters, parameters)
+    
+    async def generate_full_story_async(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate a complete fanfiction story with chapters written concurrently"""
+        outline_text = await self.llm.generate_text_async(self._create_outline_prompt(parameters), max_tokens=1000)
+        outline = self._build_outline(outline_text, parameters)
+        
+        semaphore = asyncio.Semaphore(CHAPTER_CONCURRENCY)
+        
+        async def bounded(prompt: str, max_tokens: int) -> str:
+            async with semaphore:
+                return await self.llm.generate_text_async(prompt, max_tokens=max_tokens)
+        
+        # Each chapter is conditioned on the outline only, so all of them (and
+        # the outline-based summary) can be in flight at once
+        chapter_count = self._chapter_count(parameters)
+        *chapters, summary = await asyncio.gather(
+            *(bounded(self._create_chapter_prompt(outline, i + 1), Config.MAX_CHAPTER_LENGTH)
+              for i in range(chapter_count)),
+            bounded(self._create_summary_prompt(outline), 300)
+        )
+        logger.info(f"Generated {chapter_count} chapters")
+        
+        title = await self.llm.generate_text_async(self._create_title_prompt(outline, chapters), max_tokens=50)
+        
+        return self._assemble_story(title, summary, outline, chapters, parameters)
+    
+    async def stream_full_story(self, parameters: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+        """Generate a story, yielding (event, data) pairs as text arrives
+        
+        Emits 'outline' and 'chapter' token events, then a final 'story'
+        event carrying the assembled story.
+        """
+        outline_parts = []
+        async for token in self.llm.stream_text(self._create_outline_prompt(parameters), max_tokens=1000):
+            outline_parts.append(token)
+            yield 'outline', {'text': token}
+        outline = self._build_outline(''.join(outline_parts).strip(), parameters)
+        
+        # Chapters stream concurrently; their tokens are funnelled through one
+        # queue, with a None marking each finished chapter
+        queue: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(CHAPTER_CONCURRENCY)
+        
+        async def write_chapter(number: int) -> str:
+            parts = []
+            try:
+                async with semaphore:
+                    prompt = self._create_chapter_prompt(outline, number)
+                    async for token in self.llm.stream_text(prompt, max_tokens=Config.MAX_CHAPTER_LENGTH):
+                        parts.append(token)
+                        await queue.put(('chapter', {'chapter': number, 'text': token}))
+            finally:
+                await queue.put(None)
+            return ''.join(parts).strip()
+        
+        chapter_count = self._chapter_count(parameters)
+        chapter_tasks = [asyncio.create_task(write_chapter(i + 1)) for i in range(chapter_count)]
+        summary_task = asyncio.create_task(
+            self.llm.generate_text_async(self._create_summary_prompt(outline), max_tokens=300)
+        )
+        
+        try:
+            remaining = chapter_count
+            while remaining:
+                item = await queue.get()
+                if item is None:
+                    remaining -= 1
+                else:
+                    yield item
+            
+            chapters = [task.result() for task in chapter_tasks]
+            summary = await summary_task
+        finally:
+            for task in (*chapter_tasks, summary_task):
+                task.cancel()
+        
+        title = await self.llm.generate_text_async(self._create_title_prompt(outline, chapters), max_tokens=50)
+        yield 'story', self._assemble_story(title, summary, outline, chapters, parameters)
+    
+    def _chapter_count(self, parameters: Dict[str, Any]) -> int:
+        """Number of chapters needed for the target length"""
+        target_length = parameters.get('target_length', 5000)
+        return max(1, target_length // Config.MAX_CHAPTER_LENGTH)
+    
+    def _assemble_story(self, title: str, summary: str, outline: Dict[str, Any],
+                        chapters: List[str], parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Package generated pieces into the story dict"""
         return {
             'title': title,
             'summary': summary,
@@ -285,6 +486,10 @@ class FanfictionGenerator:
     
     def generate_title(self, outline: Dict[str, Any], chapters: List[str]) -> str:
         """Generate a title for the story"""
+        return self.llm.generate_text(self._create_title_prompt(outline, chapters), max_tokens=50)
+    
+    def _create_title_prompt(self, outline: Dict[str, Any], chapters: List[str]) -> str:
+        """Create prompt for title generation"""
         first_chapter = chapters[0] if chapters else ""
         outline_text = outline['outline']
         
@@ -306,10 +511,14 @@ class FanfictionGenerator:
         Provide only the title, nothing else.
         """
         
-        return self.llm.generate_text(prompt, max_tokens=50)
+        return prompt
     
     def generate_summary(self, outline: Dict[str, Any], chapters: List[str]) -> str:
         """Generate a summary for the story"""
+        return self.llm.generate_text(self._create_summary_prompt(outline), max_tokens=300)
+    
+    def _create_summary_prompt(self, outline: Dict[str, Any]) -> str:
+        """Create prompt for summary generation"""
         outline_text = outline['outline']
         
         prompt = f"""
@@ -328,7 +537,7 @@ class FanfictionGenerator:
         Write the summary:
         """
         
-        return self.llm.generate_text(prompt, max_tokens=300)
+        return prompt
     
     def _get_popular_characters(self) -> List[str]:
         """Get popular characters from corpus analysis"""
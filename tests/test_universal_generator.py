@@ -0,0 +1,89 @@
+import sqlite3
+
+import pytest
+
+from universal_generator import Chapter, UniversalDatabaseHandler, UniversalStoryGenerator, Universe
+
+
+@pytest.fixture
+def db_handler(tmp_path):
+    handler = UniversalDatabaseHandler(str(tmp_path / "corpus.db"))
+    yield handler
+    handler.close()
+
+
+def _indexed_rows(db_handler):
+    with sqlite3.connect(db_handler.db_path) as conn:
+        corpus = conn.execute(
+            "SELECT title, characters, themes FROM fanfiction_corpus ORDER BY id"
+        ).fetchall()
+        names = conn.execute("SELECT name FROM fanfiction_characters ORDER BY story_id").fetchall()
+    return corpus, names
+
+
+def test_add_fanfiction_ignores_non_list_characters(db_handler):
+    db_handler.add_fanfiction("Harry Potter", "Good", "text", characters=["Harry Potter"], themes=["magic"])
+    db_handler.add_fanfiction("Harry Potter", "Bare", "text", characters="Ron", themes="loyalty")
+
+    assert _indexed_rows(db_handler) == (
+        [("Good", '["Harry Potter"]', '["magic"]'), ("Bare", "[]", "[]")],
+        [("Harry Potter",)],
+    )
+
+
+def test_add_fanfiction_bulk_ignores_non_list_characters(db_handler):
+    inserted = db_handler.add_fanfiction_bulk("Harry Potter", [
+        {"title": "Good", "content": "text", "characters": ["Harry Potter"], "themes": ["magic"]},
+        {"title": "Bare", "content": "text", "characters": "Ron", "themes": "loyalty"},
+    ])
+
+    assert inserted == 2
+    assert _indexed_rows(db_handler) == (
+        [("Good", '["Harry Potter"]', '["magic"]'), ("Bare", "[]", "[]")],
+        [("Harry Potter",)],
+    )
+
+
+def test_add_fanfiction_stream_ignores_non_list_characters(db_handler):
+    inserted = db_handler.add_fanfiction_stream("Harry Potter", iter([
+        {"title": "Good", "content": "text", "characters": ["Harry Potter"], "themes": ["magic"]},
+        {"title": "Bare", "content": "text", "characters": "Draco Malfoy", "themes": None},
+    ]))
+
+    assert inserted == 2
+    assert _indexed_rows(db_handler) == (
+        [("Good", '["Harry Potter"]', '["magic"]'), ("Bare", "[]", "[]")],
+        [("Harry Potter",)],
+    )
+
+
+@pytest.mark.skipif(not hasattr(sqlite3.Connection, "setlimit"), reason="needs Python 3.11+")
+def test_add_chapters_within_old_sqlite_variable_limit(tmp_path, monkeypatch):
+    connect = sqlite3.connect
+
+    def connect_with_old_limit(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        return conn
+
+    monkeypatch.setattr(sqlite3, "connect", connect_with_old_limit)
+    handler = UniversalDatabaseHandler(str(tmp_path / "stories.db"))
+    try:
+        handler.add_chapters(1, [
+            Chapter(number, 1, f"Chapter {number}", "text", [], [], 1)
+            for number in range(1, 201)
+        ])
+        count = handler._conn.execute("SELECT COUNT(*) FROM story_chapters").fetchone()[0]
+    finally:
+        handler.close()
+
+    assert count == 200
+
+
+def test_character_matching_follows_universe_updates(db_handler):
+    generator = UniversalStoryGenerator(db_handler, llm_generator=None)
+    db_handler.add_universe(Universe("Shire", "Fantasy", ["Frodo", "Sam"], [], []))
+    assert generator._extract_characters("frodo and merry set out", "Shire") == ["Frodo"]
+
+    db_handler.add_universe(Universe("Shire", "Fantasy", ["Frodo", "Merry"], [], []))
+    assert generator._extract_characters("frodo and merry set out", "Shire") == ["Frodo", "Merry"]
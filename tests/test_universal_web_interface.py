@@ -0,0 +1,114 @@
+import asyncio
+import io
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from universal_generator import UniversalDatabaseHandler, setup_universe
+
+web = pytest.importorskip("universal_web_interface", exc_type=ImportError)
+
+
+@pytest.fixture
+def db_handler(tmp_path, monkeypatch):
+    handler = UniversalDatabaseHandler(str(tmp_path / "corpus.db"))
+    monkeypatch.setattr(web, "db_handler", handler)
+    yield handler
+    handler.close()
+
+
+def test_csv_ingest_replaces_malformed_json_cells(db_handler):
+    upload = io.BytesIO(
+        b'title,content,characters,themes\n'
+        b'Good,one two three,"[""Harry Potter""]","[""magic""]"\n'
+        b'Broken,four five,"[""Harry Potter""",not json\n'
+        b'Bare,six,"""Ron Weasley""",\n'
+    )
+
+    assert web._ingest_csv_corpus("Harry Potter", upload) == 3
+
+    with sqlite3.connect(db_handler.db_path) as conn:
+        rows = conn.execute(
+            "SELECT title, characters, themes, word_count FROM fanfiction_corpus ORDER BY id"
+        ).fetchall()
+        names = conn.execute("SELECT name FROM fanfiction_characters").fetchall()
+
+    assert rows == [
+        ("Good", '["Harry Potter"]', '["magic"]', 3),
+        ("Broken", "[]", "[]", 2),
+        ("Bare", "[]", "[]", 1),
+    ]
+    assert names == [("Harry Potter",)]
+
+
+def test_json_ingest_accepts_non_integer_numbers(db_handler):
+    upload = io.BytesIO(
+        b'[{"title": "Rated", "content": "one two", "characters": ["Harry Potter"], "tags": [4.5]}]'
+    )
+
+    assert web._ingest_json_corpus("Harry Potter", upload) == 1
+
+    with sqlite3.connect(db_handler.db_path) as conn:
+        assert conn.execute("SELECT tags FROM fanfiction_corpus").fetchall() == [("[4.5]",)]
+
+
+class EchoLLM:
+    def generate_batch(self, prompts, max_tokens=None, temperature=None):
+        return [prompt.upper() for prompt in prompts]
+
+
+def test_batched_generation_survives_a_saturated_default_executor():
+    async def generate_all(count):
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=2))
+        queue = asyncio.Queue()
+        batch_pool = ThreadPoolExecutor(max_workers=1)
+        server = asyncio.create_task(web.server_loop(queue, batch_pool))
+        llm = web.BatchingLLM(EchoLLM(), loop, queue)
+        try:
+            # Every default-executor thread ends up blocked on a prompt
+            return await asyncio.wait_for(
+                asyncio.gather(*(asyncio.to_thread(llm.generate_text, f"p{i}") for i in range(count))),
+                timeout=10
+            )
+        finally:
+            server.cancel()
+            batch_pool.shutdown()
+
+    assert asyncio.run(generate_all(6)) == [f"P{i}" for i in range(6)]
+
+
+def test_queued_epic_story_job_runs_to_done(db_handler, monkeypatch):
+    models = []
+
+    class RecordingLLM(EchoLLM):
+        def __init__(self, model_type, model_name):
+            models.append((model_type, model_name))
+
+    monkeypatch.setattr(web, "LLMGenerator", RecordingLLM)
+    setup_universe(db_handler, "Harry Potter")
+    job_id = db_handler.enqueue_job("create-epic-story", {
+        "universe": "Harry Potter",
+        "story_title": "The Long Summer",
+        "main_theme": "friendship",
+        "protagonist": "Harry Potter",
+        "model_type": "ollama",
+        "model_name": "mistral",
+    })
+
+    async def run_until_finished():
+        monkeypatch.setattr(web.app, "llm_queue", asyncio.Queue(), raising=False)
+        worker = asyncio.create_task(web.job_worker())
+        try:
+            while db_handler.get_job(job_id)["status"] in ("queued", "running"):
+                await asyncio.sleep(0.05)
+        finally:
+            worker.cancel()
+
+    asyncio.run(asyncio.wait_for(run_until_finished(), timeout=10))
+
+    job = db_handler.get_job(job_id)
+    assert job["status"] == "done", job["error"]
+    assert job["result"]["story"]["title"] == "The Long Summer"
+    assert models == [("ollama", "mistral")]
@@ -0,0 +1,31 @@
+import io
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow", exc_type=ImportError)
+web = pytest.importorskip("web_interface", exc_type=ImportError)
+
+
+def test_column_stats_include_arrow_backed_columns():
+    df = pd.read_csv(
+        io.BytesIO(
+            b'title,content,word_count\n'
+            b'Alpha,first story,2\n'
+            b'Beta,second story,\n'
+            b'Alpha,,4\n'
+        ),
+        engine='pyarrow',
+        dtype_backend='pyarrow',
+    )
+
+    stats = web._compute_column_stats(df)
+
+    assert stats["title_stats"] == {
+        "unique_values": 2,
+        "null_count": 0,
+        "sample_values": ["Alpha", "Beta", "Alpha"],
+    }
+    assert stats["content_stats"]["unique_values"] == 2
+    assert stats["content_stats"]["null_count"] == 1
+    assert stats["word_count_stats"] == {"mean": 3.0, "min": 2.0, "max": 4.0, "null_count": 1}
@@ -1,8 +1,11 @@
 import re
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from typing import List, Dict, Any, Tuple
-from collections import Counter, defaultdict
+from collections import Counter
+from functools import lru_cache
 import nltk
 from nltk.tokenize import sent_tokenize, word_tokenize
 from nltk.corpus import stopwords
@@ -16,6 +19,17 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DIALOGUE_RE = re.compile(r'"[^"]*"')
+
+def _term_regex(term: str) -> str:
+    """Whole-word regex source for a lowercased term"""
+    return r'\b' + re.escape(term) + r'\b'
+
+@lru_cache(maxsize=None)
+def _term_pattern(term: str) -> re.Pattern:
+    """Compiled whole-word pattern for a lowercased term, built once per term"""
+    return re.compile(_term_regex(term))
+
 class TextAnalyzer:
     def __init__(self):
         self.download_nltk_data()
@@ -65,12 +79,12 @@ class TextAnalyzer:
         
         for character in known_characters:
             # Count full name matches
-            full_name_count = len(re.findall(r'\b' + re.escape(character.lower()) + r'\b', text_lower))
+            full_name_count = len(_term_pattern(character.lower()).findall(text_lower))
             
             # Count last name matches (for characters with multiple names)
             if ' ' in character:
                 last_name = character.split()[-1]
-                last_name_count = len(re.findall(r'\b' + re.escape(last_name.lower()) + r'\b', text_lower))
+                last_name_count = len(_term_pattern(last_name.lower()).findall(text_lower))
                 character_counts[character] = max(full_name_count, last_name_count)
             else:
                 character_counts[character] = full_name_count
@@ -83,7 +97,7 @@ class TextAnalyzer:
         text_lower = text.lower()
         
         for location in known_locations:
-            count = len(re.findall(r'\b' + re.escape(location.lower()) + r'\b', text_lower))
+            count = len(_term_pattern(location.lower()).findall(text_lower))
             if count > 0:
                 location_counts[location] = count
                 
@@ -95,7 +109,7 @@ class TextAnalyzer:
         text_lower = text.lower()
         
         for term in magical_terms:
-            count = len(re.findall(r'\b' + re.escape(term.lower()) + r'\b', text_lower))
+            count = len(_term_pattern(term.lower()).findall(text_lower))
             if count > 0:
                 magic_counts[term] = count
                 
@@ -170,8 +184,7 @@ class TextAnalyzer:
         }
         
         # Dialogue analysis
-        dialogue_pattern = r'"[^"]*"'
-        dialogue_matches = re.findall(dialogue_pattern, text)
+        dialogue_matches = DIALOGUE_RE.findall(text)
         dialogue_ratio = len(''.join(dialogue_matches)) / len(text) if text else 0
         
         # Paragraph analysis
@@ -246,7 +259,7 @@ class TextAnalyzer:
         text_lower = text.lower()
         count = 0
         for word in tension_words:
-            count += len(re.findall(r'\b' + re.escape(word) + r'\b', text_lower))
+            count += len(_term_pattern(word).findall(text_lower))
         
         return count
     
@@ -318,20 +331,35 @@ class CorpusAnalyzer:
     
     def analyze_character_usage(self, texts: List[str], characters: List[str]) -> Dict[str, Any]:
         """Analyze character usage across the corpus"""
-        character_stats = defaultdict(list)
+        if not texts:
+            return {}
         
-        for text in texts:
-            char_counts = self.analyzer.extract_characters(text, characters)
-            for char in characters:
-                character_stats[char].append(char_counts.get(char, 0))
+        # One row of mention counts per text, one column per character. Arrow's
+        # regex kernel counts a name across every text in a single call;
+        # characters with a surname count as whichever form appears more.
+        lowered = pc.utf8_lower(pa.array(texts, type=pa.large_string()))
+        
+        def mentions(term: str) -> np.ndarray:
+            return pc.count_substring_regex(lowered, _term_regex(term.lower())).to_numpy()
+        
+        counts = np.zeros((len(texts), len(characters)), dtype=np.int64)
+        for j, char in enumerate(characters):
+            counts[:, j] = mentions(char)
+            if ' ' in char:
+                np.maximum(counts[:, j], mentions(char.split()[-1]), out=counts[:, j])
+        
+        total_mentions = counts.sum(axis=0)
+        stories_featured = np.count_nonzero(counts, axis=0)
+        avg_mentions = np.divide(total_mentions, stories_featured,
+                                 out=np.zeros(len(characters)), where=stories_featured > 0)
         
         character_summary = {}
-        for char, counts in character_stats.items():
+        for j, char in enumerate(characters):
             character_summary[char] = {
-                'total_mentions': sum(counts),
-                'stories_featured': sum(1 for count in counts if count > 0),
-                'avg_mentions_per_story': np.mean([c for c in counts if c > 0]) if any(counts) else 0,
-                'popularity_score': sum(1 for count in counts if count > 0) / len(counts)
+                'total_mentions': int(total_mentions[j]),
+                'stories_featured': int(stories_featured[j]),
+                'avg_mentions_per_story': float(avg_mentions[j]),
+                'popularity_score': float(stories_featured[j] / len(texts))
             }
         
         return character_summary
@@ -15,18 +15,94 @@ Features:
 """
 
 import json
+import pickle
 import sqlite3
 import logging
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Any
+from dataclasses import dataclass
 from pathlib import Path
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from itertools import chain, islice, repeat
+from types import MappingProxyType
+
+try:
+    import ahocorasick
+except ImportError:  # optional, falls back to a regex alternation
+    ahocorasick = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Chapter batches up to this size are written with a single multi-row INSERT,
+# further capped by the bound-variable limit (9 per row): 32766 since SQLite
+# 3.32, but only 999 in the older builds some Pythons still link against
+_MULTI_ROW_INSERT_MAX = 500
+_CHAPTER_COLUMNS = 9
+_CHAPTER_INSERT = '''
+    INSERT INTO story_chapters 
+    (story_id, chapter_number, arc_number, title, content, characters_featured, plot_points, word_count, cliffhanger)
+'''
+_CHAPTER_VALUES = '(?, ?, ?, ?, ?, ?, ?, ?, ?)'
+
+# Encoding of generated_stories.arcs_data: "pickle" round-trips faster,
+# "json" keeps the column readable from the sqlite3 shell
+_SERIALIZER = "pickle"
+
+def _dump_arcs(arcs: List[Dict]) -> Any:
+    """Encode arc data for the arcs_data column"""
+    if _SERIALIZER == "pickle":
+        return pickle.dumps(arcs, protocol=5)
+    return json.dumps(arcs)
+
+def _load_arcs(data: Any) -> List[Dict]:
+    """Decode arcs_data written by either serializer"""
+    # Pickled arcs are stored as a BLOB, JSON ones as TEXT
+    if isinstance(data, bytes):
+        return pickle.loads(data)
+    return json.loads(data)
+
+_CORPUS_INSERT = '''
+    INSERT INTO fanfiction_corpus 
+    (universe, title, author, content, characters, genre, themes, word_count, chapter_count, rating, tags)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Indexes the characters of every corpus story with an id above the bound
+_CHARACTER_INDEX_INSERT = '''
+    INSERT INTO fanfiction_characters (story_id, name)
+    SELECT c.id, j.value
+    FROM fanfiction_corpus AS c, json_each(c.characters) AS j
+    WHERE c.id > ? AND c.characters IS NOT NULL AND c.characters != ''
+'''
+
+def _json_list(value: Any) -> List:
+    """A characters or themes value if it is a list, else an empty one"""
+    # json_each unnests these columns when indexing characters: a bare string
+    # would be indexed as a name, or abort the whole insert as malformed JSON
+    return value if isinstance(value, list) else []
+
+def _multi_row_insert_max(conn: sqlite3.Connection) -> int:
+    """Most chapter rows one multi-row INSERT can bind on this connection"""
+    # Connection.getlimit is Python 3.11+; assume the old default without it
+    variable_limit = (conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+                      if hasattr(conn, 'getlimit') else 999)
+    return min(_MULTI_ROW_INSERT_MAX, variable_limit // _CHAPTER_COLUMNS)
+
+def _last_corpus_id(cursor: sqlite3.Cursor) -> int:
+    """Highest fanfiction_corpus id, or 0 for an empty corpus"""
+    return cursor.execute('SELECT COALESCE(MAX(id), 0) FROM fanfiction_corpus').fetchone()[0]
+
+_WS_RE = re.compile(r"\S+")
+
+def count_words(text: str) -> int:
+    """Count whitespace-separated words without building the split list"""
+    return sum(1 for _ in _WS_RE.finditer(text))
+
 @dataclass
 class Universe:
     """Represents a fictional universe/series"""
@@ -57,9 +133,14 @@ class Arc:
     theme: str
     main_conflict: str
     character_focus: List[str]
-    chapters: List[int]  # chapter numbers in this arc
+    chapters: Tuple[int, int]  # (first, last + 1) chapter numbers in this arc
     resolution: str
     leads_to_next: str
+    
+    @property
+    def chapter_range(self) -> range:
+        """Chapter numbers in this arc"""
+        return range(*self.chapters)
 
 @dataclass
 class Chapter:
@@ -91,6 +172,22 @@ class UniversalDatabaseHandler:
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.init_database()
+        
+        # Long-lived connection for the chapter insert hot path, so its
+        # statements stay in sqlite3's prepared-statement cache; shared
+        # across threads, hence the lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=200)
+        self._conn.execute('PRAGMA cache_size=-65536')
+        # Web workers run in separate processes and contend for the write lock
+        self._conn.execute('PRAGMA busy_timeout=30000')
+        self._conn_lock = threading.Lock()
+        self._chapter_cursor = self._conn.cursor()
+        self._chapter_sql = f'{_CHAPTER_INSERT} VALUES {_CHAPTER_VALUES}'
+        self._multi_row_max = _multi_row_insert_max(self._conn)
+    
+    def close(self):
+        """Close the shared connection"""
+        self._conn.close()
     
     def init_database(self):
         """Initialize the universal database schema"""
@@ -132,6 +229,18 @@ class UniversalDatabaseHandler:
                 )
             ''')
             
+            # One row per character listed on a corpus story, so character
+            # statistics are indexed lookups instead of JSON parsing
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS fanfiction_characters (
+                    story_id INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    FOREIGN KEY (story_id) REFERENCES fanfiction_corpus (id)
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_fc_name ON fanfiction_characters (name)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_fc_story ON fanfiction_characters (story_id)')
+            
             # Generated stories table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS generated_stories (
@@ -141,7 +250,7 @@ class UniversalDatabaseHandler:
                     summary TEXT,
                     total_chapters INTEGER,
                     current_chapter INTEGER DEFAULT 0,
-                    arcs_data TEXT,      -- JSON
+                    arcs_data BLOB,      -- pickle or JSON, see _SERIALIZER
                     characters_data TEXT, -- JSON
                     metadata TEXT,       -- JSON
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -167,6 +276,24 @@ class UniversalDatabaseHandler:
                 )
             ''')
             
+            # Long-running generation requests queued by the web interface
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS generation_jobs (
+                    id INTEGER PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,   -- JSON
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    result TEXT,             -- JSON
+                    error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_jobs_queued
+                ON generation_jobs (id) WHERE status = 'queued'
+            ''')
+            
             conn.commit()
     
     def add_universe(self, universe: Universe) -> int:
@@ -189,28 +316,37 @@ class UniversalDatabaseHandler:
             ))
             return cursor.lastrowid
     
+    def get_universe_names(self) -> List[str]:
+        """Get the names of all stored universes"""
+        with self._conn_lock:
+            return [row[0] for row in self._conn.execute('SELECT name FROM universes')]
+
     def get_universe(self, name: str) -> Optional[Universe]:
         """Get universe by name"""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM universes WHERE name = ?', (name,))
+            cursor.execute('''
+                SELECT name, genre, main_characters, locations, themes, magic_system, time_period, world_building_elements
+                FROM universes WHERE name = ? LIMIT 1
+            ''', (name,))
             row = cursor.fetchone()
             
             if row:
                 return Universe(
-                    name=row[1],
-                    genre=row[2],
-                    main_characters=json.loads(row[3]),
-                    locations=json.loads(row[4]),
-                    themes=json.loads(row[5]),
-                    magic_system=row[6],
-                    time_period=row[7],
-                    world_building_elements=json.loads(row[8]) if row[8] else []
+                    name=row[0],
+                    genre=row[1],
+                    main_characters=json.loads(row[2]),
+                    locations=json.loads(row[3]),
+                    themes=json.loads(row[4]),
+                    magic_system=row[5],
+                    time_period=row[6],
+                    world_building_elements=json.loads(row[7]) if row[7] else []
                 )
         return None
     
     def add_fanfiction(self, universe: str, title: str, content: str, **metadata) -> int:
         """Add fanfiction to the corpus"""
+        characters = _json_list(metadata.get('characters'))
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
@@ -222,37 +358,316 @@ class UniversalDatabaseHandler:
                 title,
                 metadata.get('author', ''),
                 content,
-                json.dumps(metadata.get('characters', [])),
+                json.dumps(characters),
                 metadata.get('genre', ''),
-                json.dumps(metadata.get('themes', [])),
-                metadata.get('word_count', len(content.split())),
+                json.dumps(_json_list(metadata.get('themes'))),
+                metadata['word_count'] if 'word_count' in metadata else count_words(content),
                 metadata.get('chapter_count', 1),
                 metadata.get('rating', ''),
                 json.dumps(metadata.get('tags', []))
             ))
-            return cursor.lastrowid
-    
-    def get_corpus_for_universe(self, universe: str) -> List[Dict]:
-        """Get all fanfiction for a specific universe"""
-        with sqlite3.connect(self.db_path) as conn:
+            story_id = cursor.lastrowid
+            cursor.executemany(
+                'INSERT INTO fanfiction_characters (story_id, name) VALUES (?, ?)',
+                [(story_id, name) for name in characters]
+            )
+            return story_id
+
+    def add_fanfiction_bulk(self, universe: str, rows: List[Dict]) -> int:
+        """Add many fanfiction rows to the corpus in one statement and transaction"""
+        if not rows:
+            return 0
+
+        # The batch is bound as a single JSON array and unpacked by json_each;
+        # word_count is the only default SQLite can't derive on its own
+        rows = [
+            {
+                **row,
+                'characters': _json_list(row.get('characters')),
+                'themes': _json_list(row.get('themes')),
+                'word_count': row['word_count'] if 'word_count' in row else count_words(row.get('content') or '')
+            }
+            for row in rows
+        ]
+
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
             cursor = conn.cursor()
-            cursor.execute('''
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                last_id = _last_corpus_id(cursor)
+                cursor.execute('''
+                    INSERT INTO fanfiction_corpus
+                    (universe, title, author, content, characters, genre, themes, word_count, chapter_count, rating, tags)
+                    SELECT
+                        ?,
+                        json_extract(j.value, '$.title'),
+                        COALESCE(json_extract(j.value, '$.author'), ''),
+                        json_extract(j.value, '$.content'),
+                        COALESCE(json_extract(j.value, '$.characters'), '[]'),
+                        COALESCE(json_extract(j.value, '$.genre'), ''),
+                        COALESCE(json_extract(j.value, '$.themes'), '[]'),
+                        json_extract(j.value, '$.word_count'),
+                        COALESCE(json_extract(j.value, '$.chapter_count'), 1),
+                        COALESCE(json_extract(j.value, '$.rating'), ''),
+                        COALESCE(json_extract(j.value, '$.tags'), '[]')
+                    FROM json_each(?) AS j
+                ''', (universe, json.dumps(rows)))
+                inserted = cursor.rowcount
+                cursor.execute(_CHARACTER_INDEX_INSERT, (last_id,))
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+            return inserted
+        finally:
+            conn.close()
+
+    def add_fanfiction_stream(self, universe: str, stories: Iterable[Dict], batch_size: int = 1000) -> int:
+        """Add fanfiction from an iterable in executemany batches within one transaction"""
+        rows = (
+            (
+                universe,
+                story.get('title', 'Untitled'),
+                story.get('author', ''),
+                story.get('content', ''),
+                json.dumps(_json_list(story.get('characters'))),
+                story.get('genre', ''),
+                json.dumps(_json_list(story.get('themes'))),
+                story['word_count'] if 'word_count' in story else count_words(story.get('content', '')),
+                story.get('chapter_count', 1),
+                story.get('rating', ''),
+                json.dumps(story.get('tags', []))
+            )
+            for story in stories
+        )
+        return self.add_fanfiction_rows(rows, batch_size)
+
+    def add_fanfiction_rows(self, rows: Iterable[Tuple], batch_size: int = 1000) -> int:
+        """Add pre-encoded corpus rows, in _CORPUS_INSERT column order, within one transaction"""
+        rows = iter(rows)
+
+        # Only one batch of tuples is alive at a time, so memory stays flat
+        # however long the input is
+        count = 0
+        with self._conn_lock, self._conn:
+            cursor = self._conn.cursor()
+            # The implicit transaction would only start at the first INSERT;
+            # take the write lock before reading MAX(id) so no other writer
+            # can slip rows in that the character index step would re-index
+            cursor.execute('BEGIN IMMEDIATE')
+            last_id = _last_corpus_id(cursor)
+            while batch := list(islice(rows, batch_size)):
+                cursor.executemany(_CORPUS_INSERT, batch)
+                count += len(batch)
+            cursor.execute(_CHARACTER_INDEX_INSERT, (last_id,))
+        return count
+
+    def backfill_character_index(self) -> int:
+        """Index the characters of corpus stories written before fanfiction_characters existed"""
+        with self._conn_lock, self._conn:
+            cursor = self._conn.execute('''
+                INSERT INTO fanfiction_characters (story_id, name)
+                SELECT c.id, j.value
+                FROM fanfiction_corpus AS c, json_each(c.characters) AS j
+                WHERE c.characters IS NOT NULL AND c.characters != ''
+                  AND NOT EXISTS (SELECT 1 FROM fanfiction_characters AS fc WHERE fc.story_id = c.id)
+            ''')
+            return cursor.rowcount
+
+    def iter_corpus_for_universe(self, universe: str) -> Iterator[Dict]:
+        """Iterate over the fanfiction for a specific universe, one row at a time"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute('''
                 SELECT title, content, characters, genre, themes, tags 
                 FROM fanfiction_corpus 
                 WHERE universe = ?
             ''', (universe,))
             
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'title': row[0],
-                    'content': row[1],
-                    'characters': json.loads(row[2]) if row[2] else [],
-                    'genre': row[3],
-                    'themes': json.loads(row[4]) if row[4] else [],
-                    'tags': json.loads(row[5]) if row[5] else []
-                })
-            return results
+            for row in cursor:
+                yield {
+                    'title': row['title'],
+                    'content': row['content'],
+                    'characters': json.loads(row['characters']) if row['characters'] else [],
+                    'genre': row['genre'],
+                    'themes': json.loads(row['themes']) if row['themes'] else [],
+                    'tags': json.loads(row['tags']) if row['tags'] else []
+                }
+        finally:
+            conn.close()
+    
+    def add_chapters(self, story_id: int, chapters: List[Chapter]):
+        """Add a batch of generated chapters in one transaction"""
+        if not chapters:
+            return
+        
+        rows = [(
+            story_id,
+            chapter.number,
+            chapter.arc,
+            chapter.title,
+            chapter.content,
+            json.dumps(chapter.characters_featured),
+            json.dumps(chapter.plot_points),
+            chapter.word_count,
+            chapter.cliffhanger
+        ) for chapter in chapters]
+        
+        with self._conn_lock, self._conn:
+            # Take the write lock up front: a deferred transaction that has to
+            # upgrade can fail with SQLITE_BUSY while another web worker writes
+            self._chapter_cursor.execute('BEGIN IMMEDIATE')
+            if len(rows) <= self._multi_row_max:
+                # One multi-row VALUES statement beats executemany for small batches
+                values = ', '.join([_CHAPTER_VALUES] * len(rows))
+                self._chapter_cursor.execute(f'{_CHAPTER_INSERT} VALUES {values}', list(chain.from_iterable(rows)))
+            else:
+                self._chapter_cursor.executemany(self._chapter_sql, rows)
+
+    def enqueue_job(self, kind: str, payload: Dict) -> int:
+        """Queue a background generation job"""
+        with self._conn_lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT INTO generation_jobs (kind, payload) VALUES (?, ?)',
+                (kind, json.dumps(payload))
+            )
+            return cursor.lastrowid
+
+    def claim_next_job(self) -> Optional[Tuple[int, str, Dict]]:
+        """Atomically mark the oldest queued job as running and return it"""
+        with self._conn_lock, self._conn:
+            cursor = self._conn.cursor()
+            # The write lock makes SELECT-then-UPDATE atomic across worker
+            # processes without needing UPDATE ... RETURNING (SQLite 3.35+)
+            cursor.execute('BEGIN IMMEDIATE')
+            row = cursor.execute('''
+                SELECT id, kind, payload FROM generation_jobs
+                WHERE status = 'queued' ORDER BY id LIMIT 1
+            ''').fetchone()
+            if row is not None:
+                cursor.execute('''
+                    UPDATE generation_jobs
+                    SET status = 'running', updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', (row[0],))
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2])
+
+    def requeue_stale_jobs(self, older_than_seconds: int = 0) -> int:
+        """Put jobs left 'running' by a stopped worker back in the queue"""
+        with self._conn_lock, self._conn:
+            cursor = self._conn.execute('''
+                UPDATE generation_jobs
+                SET status = 'queued', updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'running' AND updated_at <= datetime('now', ?)
+            ''', (f'-{older_than_seconds} seconds',))
+            return cursor.rowcount
+
+    def finish_job(self, job_id: int, result: Optional[Dict] = None, error: Optional[str] = None):
+        """Record the outcome of a background job"""
+        with self._conn_lock, self._conn:
+            self._conn.execute('''
+                UPDATE generation_jobs
+                SET status = ?, result = ?, error = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', ('failed' if error else 'done', json.dumps(result) if result is not None else None, error, job_id))
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        """Get a background job's status and result"""
+        with self._conn_lock:
+            row = self._conn.execute('''
+                SELECT id, kind, status, result, error, created_at, updated_at
+                FROM generation_jobs WHERE id = ?
+            ''', (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            'id': row[0],
+            'kind': row[1],
+            'status': row[2],
+            'result': json.loads(row[3]) if row[3] else None,
+            'error': row[4],
+            'created_at': row[5],
+            'updated_at': row[6]
+        }
+
+def _build_character_matcher(characters: List[str]) -> Callable[[str], List[str]]:
+    """Build a single-pass matcher returning the characters named in lowercased text"""
+    if not characters:
+        return lambda content_lower: []
+
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for char in characters:
+            automaton.add_word(char.lower(), char)
+        automaton.make_automaton()
+        find = lambda content_lower: {char for _, char in automaton.iter(content_lower)}
+    else:
+        names = {char.lower(): char for char in characters}
+        # Zero-width lookahead so names nested inside longer ones still match
+        pattern = re.compile('(?=(%s))' % '|'.join(
+            re.escape(name) for name in sorted(names, key=len, reverse=True)
+        ))
+        find = lambda content_lower: {names[m.group(1)] for m in pattern.finditer(content_lower)}
+
+    def match(content_lower: str) -> List[str]:
+        found = find(content_lower)
+        # Keep the universe's character order in the result
+        return [char for char in characters if char in found]
+
+    return match
+
+# Arc blueprints and conflict templates shared by every EpicStoryPlanner
+_ARC_TEMPLATES = (
+    MappingProxyType({
+        "title": "The Awakening",
+        "theme": "Discovery and Introduction",
+        "conflict_type": "Internal/Setup",
+        "description": "Protagonist discovers their destiny, new powers, or hidden truth"
+    }),
+    MappingProxyType({
+        "title": "The Rising Storm", 
+        "theme": "Challenges and Growth",
+        "conflict_type": "External/Building",
+        "description": "First major conflicts, allies and enemies revealed"
+    }),
+    MappingProxyType({
+        "title": "The Crucible",
+        "theme": "Trials and Transformation", 
+        "conflict_type": "Major Crisis",
+        "description": "Greatest challenges, character transformation, major losses"
+    }),
+    MappingProxyType({
+        "title": "The Convergence",
+        "theme": "Preparation and Alliance",
+        "conflict_type": "Building to Climax",
+        "description": "Gathering forces, final preparations, ultimate confrontation approaches"
+    }),
+    MappingProxyType({
+        "title": "The Resolution",
+        "theme": "Climax and New Beginning",
+        "conflict_type": "Final Battle/Resolution",
+        "description": "Ultimate confrontation, resolution of all conflicts, new world order"
+    })
+)
+
+_CONFLICT_TEMPLATES = MappingProxyType({
+    "Internal/Setup": "Discovering the truth about {main_theme} and accepting responsibility",
+    "External/Building": "First confrontations with forces opposing {main_theme}",
+    "Major Crisis": "The greatest threat to {main_theme} emerges, testing all beliefs",
+    "Building to Climax": "Final preparations to resolve the {main_theme} crisis",
+    "Final Battle/Resolution": "Ultimate confrontation that determines the fate of {main_theme}"
+})
+
+_ARC_TRANSITIONS = (
+    "New threats emerge from the shadows",
+    "Unexpected allies reveal hidden agendas", 
+    "The true scope of the conflict becomes clear",
+    "Final pieces fall into place for ultimate confrontation"
+)
 
 class EpicStoryPlanner:
     """Plans epic multi-arc stories with 1000+ chapters"""
@@ -263,48 +678,15 @@ class EpicStoryPlanner:
     def create_epic_structure(self, main_theme: str, protagonist: str) -> List[Arc]:
         """Create 5-arc structure for epic story"""
         
-        arc_templates = [
-            {
-                "title": "The Awakening",
-                "theme": "Discovery and Introduction",
-                "conflict_type": "Internal/Setup",
-                "description": "Protagonist discovers their destiny, new powers, or hidden truth"
-            },
-            {
-                "title": "The Rising Storm", 
-                "theme": "Challenges and Growth",
-                "conflict_type": "External/Building",
-                "description": "First major conflicts, allies and enemies revealed"
-            },
-            {
-                "title": "The Crucible",
-                "theme": "Trials and Transformation", 
-                "conflict_type": "Major Crisis",
-                "description": "Greatest challenges, character transformation, major losses"
-            },
-            {
-                "title": "The Convergence",
-                "theme": "Preparation and Alliance",
-                "conflict_type": "Building to Climax",
-                "description": "Gathering forces, final preparations, ultimate confrontation approaches"
-            },
-            {
-                "title": "The Resolution",
-                "theme": "Climax and New Beginning",
-                "conflict_type": "Final Battle/Resolution",
-                "description": "Ultimate confrontation, resolution of all conflicts, new world order"
-            }
-        ]
-        
         arcs = []
-        for i, template in enumerate(arc_templates, 1):
+        for i, template in enumerate(_ARC_TEMPLATES, 1):
             arc = Arc(
                 number=i,
                 title=f"{template['title']}: {main_theme}",
                 theme=template['theme'],
                 main_conflict=self._generate_arc_conflict(template['conflict_type'], main_theme),
                 character_focus=[protagonist] + self._select_arc_characters(i),
-                chapters=list(range((i-1)*200 + 1, i*200 + 1)),  # 200 chapters per arc
+                chapters=((i-1)*200 + 1, i*200 + 1),  # 200 chapters per arc
                 resolution=self._generate_arc_resolution(i, template['description']),
                 leads_to_next=self._generate_arc_transition(i) if i < 5 else "Epic Conclusion"
             )
@@ -314,14 +696,8 @@ class EpicStoryPlanner:
     
     def _generate_arc_conflict(self, conflict_type: str, main_theme: str) -> str:
         """Generate specific conflict for arc based on type and theme"""
-        conflicts = {
-            "Internal/Setup": f"Discovering the truth about {main_theme} and accepting responsibility",
-            "External/Building": f"First confrontations with forces opposing {main_theme}",
-            "Major Crisis": f"The greatest threat to {main_theme} emerges, testing all beliefs",
-            "Building to Climax": f"Final preparations to resolve the {main_theme} crisis",
-            "Final Battle/Resolution": f"Ultimate confrontation that determines the fate of {main_theme}"
-        }
-        return conflicts.get(conflict_type, f"Major conflict involving {main_theme}")
+        template = _CONFLICT_TEMPLATES.get(conflict_type, "Major conflict involving {main_theme}")
+        return template.format(main_theme=main_theme)
     
     def _select_arc_characters(self, arc_number: int) -> List[str]:
         """Select key characters for each arc"""
@@ -335,21 +711,24 @@ class EpicStoryPlanner:
     
     def _generate_arc_transition(self, arc_number: int) -> str:
         """Generate transition to next arc"""
-        transitions = [
-            "New threats emerge from the shadows",
-            "Unexpected allies reveal hidden agendas", 
-            "The true scope of the conflict becomes clear",
-            "Final pieces fall into place for ultimate confrontation"
-        ]
-        return transitions[arc_number - 1] if arc_number <= len(transitions) else "The story continues..."
+        return _ARC_TRANSITIONS[arc_number - 1] if arc_number <= len(_ARC_TRANSITIONS) else "The story continues..."
 
 class UniversalStoryGenerator:
     """Generates stories for any universe with epic structure"""
     
+    # Sentence markers for plot point and cliffhanger extraction
+    _PLOT_RE = re.compile(r"\b(discovered|revealed|decided|confronted|realized)\b", re.IGNORECASE)
+    _CLIFF_RE = re.compile(r"\b(suddenly|but then|however|unexpectedly)\b", re.IGNORECASE)
+    
     def __init__(self, db_handler: UniversalDatabaseHandler, llm_generator):
         self.db = db_handler
         self.llm = llm_generator
         self.planner = None
+        # Keyed on the cast rather than the universe name: add_universe can
+        # replace a universe's characters, from any worker process
+        self._char_matchers: Dict[Tuple[str, ...], Callable[[str], List[str]]] = {}
+        # Story structure is immutable once saved, so it is read from SQLite once per story
+        self._story_cache: Dict[int, Dict] = {}
     
     def set_universe(self, universe_name: str):
         """Set the current universe for generation"""
@@ -403,39 +782,48 @@ class UniversalStoryGenerator:
                                  story_id: int, 
                                  arc_number: int, 
                                  start_chapter: int = 1,
-                                 num_chapters: int = 10) -> List[Chapter]:
-        """Generate specific chapters for an arc"""
+                                 num_chapters: int = 10,
+                                 max_workers: Optional[int] = None) -> List[Chapter]:
+        """Generate specific chapters for an arc, running the LLM calls concurrently"""
         
         # Get story and arc info
         story_data = self._get_story_data(story_id)
         arc = story_data['arcs'][arc_number - 1]
         
-        chapters = []
-        for i in range(num_chapters):
-            chapter_num = start_chapter + i
-            if chapter_num > 200:  # Max chapters per arc
-                break
-                
-            chapter = self._generate_single_chapter(
-                story_data, arc, chapter_num, arc_number
-            )
-            chapters.append(chapter)
-            
-            # Save chapter to database
-            self._save_chapter(story_id, chapter)
-            
-            logger.info(f"Generated Chapter {chapter_num} of Arc {arc_number}")
+        chapter_nums = range(start_chapter, min(start_chapter + num_chapters, 201))  # Max 200 chapters per arc
+        if not chapter_nums:
+            return []
+        
+        # Everything but the chapter number is shared by the whole batch
+        arc_header = self._create_arc_prompt_header(story_data, arc)
+        # Build the character matcher up front so the workers only read it
+        self._get_character_matcher(story_data['universe'])
+        
+        # Chapters only depend on the story and arc, so the LLM calls can overlap
+        generate = partial(self._generate_single_chapter, story_data, arc, arc_header=arc_header)
+        with ThreadPoolExecutor(max_workers=min(max_workers or len(chapter_nums), len(chapter_nums))) as executor:
+            chapters = list(executor.map(generate, chapter_nums, repeat(arc_number)))
+        
+        # Save chapters to database
+        self._save_chapters(story_id, chapters)
+        
+        for chapter in chapters:
+            logger.info(f"Generated Chapter {chapter.number} of Arc {arc_number}")
         
         return chapters
     
-    def _generate_single_chapter(self, story_data: Dict, arc: Dict, chapter_num: int, arc_number: int) -> Chapter:
+    def _generate_single_chapter(self, story_data: Dict, arc: Dict, chapter_num: int, arc_number: int,
+                                 arc_header: Optional[str] = None) -> Chapter:
         """Generate a single chapter using LLM"""
         
         # Determine chapter position in arc
         arc_progress = chapter_num / 200  # Progress through current arc
         
         # Create chapter prompt
-        prompt = self._create_chapter_prompt(story_data, arc, chapter_num, arc_progress)
+        if arc_header is None:
+            prompt = self._create_chapter_prompt(story_data, arc, chapter_num, arc_progress)
+        else:
+            prompt = self._create_chapter_prompt_fast(arc_header, chapter_num, arc_progress)
         
         # Generate content using LLM
         content = self.llm.generate_text(prompt, max_tokens=2000)
@@ -443,45 +831,58 @@ class UniversalStoryGenerator:
         # Extract chapter title from content or generate one
         title = self._extract_or_generate_title(content, chapter_num, arc)
         
+        # Tokenize once and share across the extractors
+        sentences = content.split('.')
+        content_lower = content.lower()
+        
         # Create chapter object
         chapter = Chapter(
             number=chapter_num,
             arc=arc_number,
             title=title,
             content=content,
-            characters_featured=self._extract_characters(content, story_data['universe']),
-            plot_points=self._extract_plot_points(content),
-            word_count=len(content.split()),
-            cliffhanger=self._extract_cliffhanger(content) if chapter_num % 10 == 0 else None
+            characters_featured=self._extract_characters(content_lower, story_data['universe']),
+            plot_points=self._extract_plot_points(sentences),
+            word_count=count_words(content),
+            cliffhanger=self._extract_cliffhanger(sentences) if chapter_num % 10 == 0 else None
         )
         
         return chapter
     
     def _create_chapter_prompt(self, story_data: Dict, arc: Dict, chapter_num: int, arc_progress: float) -> str:
         """Create detailed prompt for chapter generation"""
+        arc_header = self._create_arc_prompt_header(story_data, arc)
+        return self._create_chapter_prompt_fast(arc_header, chapter_num, arc_progress)
+    
+    def _create_arc_prompt_header(self, story_data: Dict, arc: Dict) -> str:
+        """Render the arc-invariant part of the chapter prompt as a str.format template"""
         
         universe = story_data['universe']
-        corpus_sample = self.db.get_corpus_for_universe(universe)[:5]  # Sample for style
+        corpus_sample = list(islice(self.db.iter_corpus_for_universe(universe), 5))  # Sample for style
+        
+        # Only {chapter_num} and {arc_progress} are left for _create_chapter_prompt_fast
+        def esc(value) -> str:
+            return str(value).replace('{', '{{').replace('}', '}}')
         
-        prompt = f"""
-Generate Chapter {chapter_num} of the epic {universe} fanfiction "{story_data['title']}".
+        return f"""
+Generate Chapter {{chapter_num}} of the epic {esc(universe)} fanfiction "{esc(story_data['title'])}".
 
 STORY CONTEXT:
-- Universe: {universe}
-- Main Theme: {story_data.get('main_theme', 'Epic Adventure')}
-- Current Arc: {arc['title']} (Arc {arc['number']}/5)
-- Arc Theme: {arc['theme']}
-- Arc Conflict: {arc['main_conflict']}
-- Chapter Position: {chapter_num}/200 in this arc ({arc_progress:.1%} through arc)
+- Universe: {esc(universe)}
+- Main Theme: {esc(story_data.get('main_theme', 'Epic Adventure'))}
+- Current Arc: {esc(arc['title'])} (Arc {arc['number']}/5)
+- Arc Theme: {esc(arc['theme'])}
+- Arc Conflict: {esc(arc['main_conflict'])}
+- Chapter Position: {{chapter_num}}/200 in this arc ({{arc_progress:.1%}} through arc)
 
 STYLE REFERENCE:
-Based on the writing style of the {universe} fanfiction corpus, maintain consistency with:
-{self._format_style_reference(corpus_sample)}
+Based on the writing style of the {esc(universe)} fanfiction corpus, maintain consistency with:
+{esc(self._format_style_reference(corpus_sample))}
 
 CHAPTER REQUIREMENTS:
 - Word count: 1500-2500 words
-- Include character development for: {', '.join(arc['character_focus'])}
-- Advance the arc's main conflict: {arc['main_conflict']}
+- Include character development for: {esc(', '.join(arc['character_focus']))}
+- Advance the arc's main conflict: {esc(arc['main_conflict'])}
 - Maintain continuity with previous chapters
 - End with appropriate tension for chapter position in arc
 
@@ -494,7 +895,10 @@ CHAPTER STRUCTURE:
 
 Generate the chapter content now:
 """
-        return prompt
+    
+    def _create_chapter_prompt_fast(self, arc_header: str, chapter_num: int, arc_progress: float) -> str:
+        """Fill the chapter-local fields into a prompt header from _create_arc_prompt_header"""
+        return arc_header.format(chapter_num=chapter_num, arc_progress=arc_progress)
     
     def _format_style_reference(self, corpus_sample: List[Dict]) -> str:
         """Format corpus sample for style reference"""
@@ -508,38 +912,36 @@ Generate the chapter content now:
         
         return "\n".join(styles)
     
-    def _extract_characters(self, content: str, universe: str) -> List[str]:
-        """Extract character names mentioned in chapter"""
+    def _extract_characters(self, content_lower: str, universe: str) -> List[str]:
+        """Extract character names mentioned in chapter (expects lowercased content)"""
+        matcher = self._get_character_matcher(universe)
+        return matcher(content_lower) if matcher else []
+    
+    def _get_character_matcher(self, universe: str) -> Optional[Callable[[str], List[str]]]:
+        """Get the character matcher for a universe's current cast, building it on first use"""
         universe_data = self.db.get_universe(universe)
         if not universe_data:
-            return []
-        
-        characters = []
-        for char in universe_data.main_characters:
-            if char.lower() in content.lower():
-                characters.append(char)
-        
-        return characters
+            return None
+        characters = tuple(universe_data.main_characters)
+        matcher = self._char_matchers.get(characters)
+        if matcher is None:
+            matcher = _build_character_matcher(characters)
+            self._char_matchers[characters] = matcher
+        return matcher
     
-    def _extract_plot_points(self, content: str) -> List[str]:
-        """Extract key plot points from chapter"""
+    def _extract_plot_points(self, sentences: List[str]) -> List[str]:
+        """Extract key plot points from chapter sentences"""
         # Simple extraction - could be enhanced with NLP
-        sentences = content.split('.')
-        plot_points = []
-        
-        for sentence in sentences:
-            if any(keyword in sentence.lower() for keyword in ['discovered', 'revealed', 'decided', 'confronted', 'realized']):
-                plot_points.append(sentence.strip())
+        plot_points = [s.strip() for s in sentences if self._PLOT_RE.search(s)]
         
         return plot_points[:3]  # Top 3 plot points
     
-    def _extract_cliffhanger(self, content: str) -> Optional[str]:
-        """Extract cliffhanger from chapter ending"""
-        sentences = content.split('.')
+    def _extract_cliffhanger(self, sentences: List[str]) -> Optional[str]:
+        """Extract cliffhanger from chapter ending sentences"""
         last_sentences = sentences[-3:]  # Last 3 sentences
         
         for sentence in reversed(last_sentences):
-            if any(word in sentence.lower() for word in ['suddenly', 'but then', 'however', 'unexpectedly']):
+            if self._CLIFF_RE.search(sentence):
                 return sentence.strip()
         
         return None
@@ -567,34 +969,30 @@ Generate the chapter content now:
                 story.universe,
                 story.summary,
                 story.total_chapters,
-                json.dumps([asdict(arc) for arc in story.arcs]),
-                json.dumps([asdict(char) for char in story.characters]),
+                _dump_arcs([vars(arc) for arc in story.arcs]),
+                json.dumps([vars(char) for char in story.characters]),
                 json.dumps(story.metadata)
             ))
-            return cursor.lastrowid
+            story_id = cursor.lastrowid
+        
+        self._story_cache.pop(story_id, None)
+        return story_id
     
-    def _save_chapter(self, story_id: int, chapter: Chapter):
-        """Save chapter to database"""
-        with sqlite3.connect(self.db.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO story_chapters 
-                (story_id, chapter_number, arc_number, title, content, characters_featured, plot_points, word_count, cliffhanger)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                story_id,
-                chapter.number,
-                chapter.arc,
-                chapter.title,
-                chapter.content,
-                json.dumps(chapter.characters_featured),
-                json.dumps(chapter.plot_points),
-                chapter.word_count,
-                chapter.cliffhanger
-            ))
+    def _save_chapters(self, story_id: int, chapters: List[Chapter]):
+        """Save a batch of chapters to database in one transaction"""
+        self.db.add_chapters(story_id, chapters)
     
     def _get_story_data(self, story_id: int) -> Dict:
-        """Get story data from database"""
+        """Get story data, loading it from database on first use"""
+        story_data = self._story_cache.get(story_id)
+        if story_data is None:
+            story_data = self._load_story_data(story_id)
+            if story_data:
+                self._story_cache[story_id] = story_data
+        return story_data
+    
+    def _load_story_data(self, story_id: int) -> Dict:
+        """Load story data from database"""
         with sqlite3.connect(self.db.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
@@ -608,7 +1006,7 @@ Generate the chapter content now:
                     'title': row[0],
                     'universe': row[1],
                     'summary': row[2],
-                    'arcs': json.loads(row[3]),
+                    'arcs': _load_arcs(row[3]),
                     'metadata': json.loads(row[4])
                 }
         return {}
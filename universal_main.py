@@ -27,16 +27,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DB_PATH = "universal_fanfiction.db"
+
+# punkt and stopwords are only used by text_analyzer, which fetches its own
+NLTK_RESOURCES = (
+    ('sentiment/vader_lexicon.zip', 'vader_lexicon'),
+)
+
+# Written once the NLTK data is in place, so later runs skip the check
+NLTK_STAMP = Path.home() / ".fanfic_nltk.ok"
+
 def setup_environment():
     """Setup the environment and dependencies"""
-    try:
-        import nltk
-        nltk.download('vader_lexicon', quiet=True)
-        nltk.download('punkt', quiet=True)
-        nltk.download('stopwords', quiet=True)
-        logger.info("NLTK data downloaded successfully")
-    except Exception as e:
-        logger.warning(f"Could not download NLTK data: {e}")
+    if not NLTK_STAMP.exists():
+        try:
+            import nltk
+            # Only hit the network for resources that aren't installed yet
+            for resource, package in NLTK_RESOURCES:
+                try:
+                    nltk.data.find(resource)
+                except LookupError:
+                    if not nltk.download(package, quiet=True):
+                        raise RuntimeError(f"download of {package} failed")
+            NLTK_STAMP.touch()
+            logger.info("NLTK data available")
+        except Exception as e:
+            logger.warning(f"Could not download NLTK data: {e}")
     
     # Ensure required directories exist
     Path("generated").mkdir(exist_ok=True)
@@ -47,18 +63,11 @@ def setup_environment():
 def run_web_interface():
     """Launch the web interface"""
     try:
-        import uvicorn
-        from universal_web_interface import app
+        from universal_web_interface import serve
         
         logger.info("Starting Universal Fanfiction Generator web interface...")
         
-        uvicorn.run(
-            "universal_web_interface:app",
-            host="0.0.0.0",
-            port=12000,
-            reload=False,
-            log_level="info"
-        )
+        serve(host="0.0.0.0", port=12000)
     except ImportError as e:
         logger.error(f"Missing dependencies for web interface: {e}")
         logger.error("Please install: pip install fastapi uvicorn jinja2")
@@ -67,22 +76,21 @@ def run_web_interface():
         logger.error(f"Error starting web interface: {e}")
         sys.exit(1)
 
-def run_cli_mode(args):
-    """Run CLI operations"""
-    from universal_generator import (
-        UniversalDatabaseHandler, 
-        UniversalStoryGenerator, 
-        POPULAR_UNIVERSES,
-        setup_universe
-    )
+def _create_story_generator():
+    """Build the database, LLM and story generator for the generation actions"""
+    from universal_generator import UniversalDatabaseHandler, UniversalStoryGenerator
     from llm_generator import LLMGenerator
     
-    # Initialize components
-    db_handler = UniversalDatabaseHandler("universal_fanfiction.db")
+    db_handler = UniversalDatabaseHandler(DB_PATH)
     llm_generator = LLMGenerator()
-    story_generator = UniversalStoryGenerator(db_handler, llm_generator)
-    
+    return llm_generator, UniversalStoryGenerator(db_handler, llm_generator)
+
+def run_cli_mode(args):
+    """Run CLI operations"""
+    # Each action imports and initializes only what it uses
     if args.action == 'list-universes':
+        from universal_generator import POPULAR_UNIVERSES
+        
         print("\n🌌 Available Universes:")
         print("=" * 50)
         for name, universe in POPULAR_UNIVERSES.items():
@@ -98,7 +106,9 @@ def run_cli_mode(args):
             return
         
         try:
-            universe = setup_universe(db_handler, args.universe)
+            from universal_generator import UniversalDatabaseHandler, setup_universe
+            
+            universe = setup_universe(UniversalDatabaseHandler(DB_PATH), args.universe)
             print(f"✅ Successfully setup {args.universe} universe")
             print(f"   Genre: {universe.genre}")
             print(f"   Characters: {len(universe.main_characters)}")
@@ -112,6 +122,8 @@ def run_cli_mode(args):
             return
         
         try:
+            llm_generator, story_generator = _create_story_generator()
+            
             # Configure LLM
             llm_generator.configure(args.model_type, args.model_name)
             
@@ -136,7 +148,7 @@ def run_cli_mode(args):
             for arc in story.arcs:
                 print(f"   Arc {arc.number}: {arc.title}")
                 print(f"      Theme: {arc.theme}")
-                print(f"      Chapters: {len(arc.chapters)}")
+                print(f"      Chapters: {len(arc.chapter_range)}")
             
         except Exception as e:
             print(f"❌ Error creating epic story: {e}")
@@ -147,6 +159,8 @@ def run_cli_mode(args):
             return
         
         try:
+            _, story_generator = _create_story_generator()
+            
             print(f"📝 Generating chapters for Story ID {args.story_id}, Arc {args.arc}")
             print(f"   Chapters: {args.start_chapter} to {args.start_chapter + args.num_chapters - 1}")
             
@@ -172,7 +186,7 @@ def run_cli_mode(args):
         try:
             import sqlite3
             
-            with sqlite3.connect(db_handler.db_path) as conn:
+            with sqlite3.connect(DB_PATH) as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT id, title, universe, total_chapters, current_chapter, created_at
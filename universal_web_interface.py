@@ -10,19 +10,30 @@ from any novel universe with 1000+ chapters across 5 arcs.
 from fastapi import FastAPI, Request, Form, File, UploadFile, HTTPException
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
 import uvicorn
-import json
+import orjson
 import asyncio
-from typing import Optional, List, Dict
+import codecs
+import csv
+import hashlib
+import os
+import ijson
+import msgspec
+import aiosqlite
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Tuple
 import logging
 from pathlib import Path
+from cachetools import TTLCache
 
 from universal_generator import (
     UniversalDatabaseHandler, 
     UniversalStoryGenerator, 
     POPULAR_UNIVERSES,
-    setup_universe
+    setup_universe,
+    count_words
 )
 from llm_generator import LLMGenerator
 
@@ -30,30 +41,260 @@ from llm_generator import LLMGenerator
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Universal Fanfiction Generator", version="2.0.0")
+app = FastAPI(
+    title="Universal Fanfiction Generator",
+    version="2.0.0",
+    default_response_class=ORJSONResponse
+)
 templates = Jinja2Templates(directory="templates")
 
+UNIVERSE_KEYS: List[str] = list(POPULAR_UNIVERSES.keys())
+
+# Uvicorn worker processes. Each has its own connection pool, LLM batch
+# queue and job worker; SQLite WAL plus the busy timeout serializes writes.
+# Response caches can't be invalidated across processes, so they are only
+# used with a single worker.
+WEB_WORKERS = int(os.environ.get("FANFIC_WEB_WORKERS", "1"))
+RESPONSE_CACHE_ENABLED = WEB_WORKERS == 1
+
 # Global instances
 db_handler = None
 story_generator = None
 llm_generator = None
 
+# The index only depends on UNIVERSE_KEYS, so it is rendered once at startup
+index_page: Optional[Tuple[bytes, str]] = None
+
+def _render_index() -> Tuple[bytes, str]:
+    """Render the main page and its ETag"""
+    body = templates.get_template("universal_index.html").render(universes=UNIVERSE_KEYS).encode()
+    return body, f'"{hashlib.md5(body).hexdigest()}"'
+
+# Pooled aiosqlite connections shared by the read endpoints, so reads
+# await SQLite instead of blocking the event loop
+POOL_SIZE = 8
+_conn_pool: "asyncio.Queue[aiosqlite.Connection]" = asyncio.Queue()
+
+async def _open_pooled_connection(db_path: str) -> aiosqlite.Connection:
+    """Open a WAL-mode autocommit connection for the pool"""
+    conn = await aiosqlite.connect(db_path, isolation_level=None, cached_statements=200)
+    await conn.execute("PRAGMA journal_mode=WAL")
+    await conn.execute("PRAGMA synchronous=NORMAL")
+    await conn.execute("PRAGMA cache_size=-65536")
+    await conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+# SQL issued by the read endpoints. Always passing these exact strings
+# lets each connection's statement cache reuse the compiled statements.
+SQL_GET_CHAPTER = '''
+    SELECT title, content, arc_number, characters_featured, plot_points, word_count, cliffhanger
+    FROM story_chapters 
+    WHERE story_id = ? AND chapter_number = ?
+'''
+
+# Casting to BLOB hands back the stored UTF-8 bytes without a str round-trip
+SQL_GET_CHAPTER_TEXT = '''
+    SELECT CAST(content AS BLOB)
+    FROM story_chapters 
+    WHERE story_id = ? AND chapter_number = ?
+'''
+
+SQL_GET_STORIES = '''
+    SELECT id, title, universe, summary, total_chapters, current_chapter, created_at
+    FROM generated_stories
+    ORDER BY created_at DESC
+'''
+
+SQL_CORPUS_TOTALS = '''
+    SELECT COUNT(*), AVG(word_count), SUM(word_count)
+    FROM fanfiction_corpus 
+    WHERE universe = ?
+'''
+
+SQL_TOP_CHARACTERS = '''
+    SELECT fc.name, COUNT(*) AS n
+    FROM fanfiction_characters AS fc
+    JOIN fanfiction_corpus AS c ON c.id = fc.story_id
+    WHERE c.universe = ?
+    GROUP BY fc.name
+    ORDER BY n DESC
+    LIMIT 10
+'''
+
+# Continuous batching of LLM prompts issued by concurrent requests
+BATCH_MAX = 8
+BATCH_WINDOW_MS = 20
+
+class BatchingLLM:
+    """Routes generate_text calls through the server's prompt queue"""
+    
+    def __init__(self, llm, loop: asyncio.AbstractEventLoop, llm_queue: asyncio.Queue):
+        self._llm = llm
+        self._loop = loop
+        self._queue = llm_queue
+    
+    def __getattr__(self, name):
+        return getattr(self._llm, name)
+    
+    def generate_text(self, prompt: str, max_tokens: int = None, temperature: float = None) -> str:
+        """Queue a prompt for the next batch and wait for its completion"""
+        future = asyncio.run_coroutine_threadsafe(
+            self._submit(prompt, max_tokens, temperature), self._loop
+        )
+        return future.result()
+    
+    async def _submit(self, prompt: str, max_tokens: Optional[int], temperature: Optional[float]) -> str:
+        response_q: asyncio.Queue = asyncio.Queue(maxsize=1)
+        await self._queue.put((self._llm, prompt, max_tokens, temperature, response_q))
+        result = await response_q.get()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+async def server_loop(llm_queue: asyncio.Queue, batch_pool: ThreadPoolExecutor):
+    """Drain queued prompts into batched LLM calls"""
+    # Batches run on their own executor: the threads waiting on these prompts
+    # come from the default one, and if they filled it a batch sent there
+    # could never start
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await llm_queue.get()]
+        deadline = asyncio.get_running_loop().time() + BATCH_WINDOW_MS / 1000
+        while len(batch) < BATCH_MAX:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(llm_queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        # Prompts can only share a call when their model and generation settings match
+        groups: Dict[tuple, list] = {}
+        for item in batch:
+            groups.setdefault(item[:3], []).append(item)
+        
+        for (llm, max_tokens, temperature), items in groups.items():
+            try:
+                results = await loop.run_in_executor(
+                    batch_pool, llm.generate_batch,
+                    [item[1] for item in items], max_tokens, temperature
+                )
+            except Exception as e:
+                logger.error(f"Batched generation failed: {e}")
+                results = [e] * len(items)
+            for item, result in zip(items, results):
+                item[4].put_nowait(result)
+
+@asynccontextmanager
+async def get_conn():
+    """Borrow a connection from the pool for the duration of the block"""
+    conn = await _conn_pool.get()
+    try:
+        yield conn
+    finally:
+        _conn_pool.put_nowait(conn)
+
+# Typed response records for the hottest read endpoints; msgspec encodes
+# these through a specialized path instead of walking generic dicts
+class ChapterItem(msgspec.Struct):
+    title: Optional[str]
+    content: Optional[str]
+    arc_number: Optional[int]
+    characters_featured: List[str]
+    plot_points: List[str]
+    word_count: Optional[int]
+    cliffhanger: Optional[str]
+
+class ChapterResponse(msgspec.Struct):
+    status: str
+    chapter: ChapterItem
+
+class StoryItem(msgspec.Struct):
+    id: int
+    title: str
+    universe: str
+    summary: Optional[str]
+    total_chapters: Optional[int]
+    current_chapter: Optional[int]
+    created_at: Optional[str]
+
+class StoriesResponse(msgspec.Struct):
+    status: str
+    stories: List[StoryItem]
+
+_msgspec_encoder = msgspec.json.Encoder()
+_decode_str_list = msgspec.json.Decoder(List[str]).decode
+
+# Short-lived cache of idempotent GET bodies keyed on (route, params);
+# write endpoints drop the keys they affect
+_response_cache: TTLCache = TTLCache(maxsize=512, ttl=30)
+
+# Bumped by every invalidation. A reader notes it before querying and only
+# caches its result if no write invalidated anything in the meantime, so a
+# read that raced a write can't put pre-write data back for a whole TTL.
+_cache_generation = 0
+
+def _cache_response(key: tuple, payload, generation: int) -> Tuple[bytes, str]:
+    """Render a payload once and cache its body alongside an ETag"""
+    if isinstance(payload, msgspec.Struct):
+        body = _msgspec_encoder.encode(payload)
+    else:
+        body = ORJSONResponse(payload).body
+    entry = (body, f'"{hashlib.md5(body).hexdigest()}"')
+    if RESPONSE_CACHE_ENABLED and generation == _cache_generation:
+        _response_cache[key] = entry
+    return entry
+
+def _cached_response(request: Request, entry: Tuple[bytes, str],
+                     media_type: str = "application/json") -> Response:
+    """Serve a cached body, or 304 when the client already has it"""
+    body, etag = entry
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type=media_type, headers={"ETag": etag})
+
+def _invalidate(*key):
+    """Drop a cached GET response after a write"""
+    global _cache_generation
+    _cache_generation += 1
+    _response_cache.pop(key, None)
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application"""
-    global db_handler, story_generator, llm_generator
+    global db_handler, story_generator, llm_generator, index_page
+    
+    index_page = _render_index()
     
     # Initialize database
     db_handler = UniversalDatabaseHandler("universal_fanfiction.db")
+    indexed = db_handler.backfill_character_index()
+    if indexed:
+        logger.info(f"Indexed {indexed} character mentions from existing corpus stories")
+    for _ in range(POOL_SIZE):
+        _conn_pool.put_nowait(await _open_pooled_connection(db_handler.db_path))
     
     # Initialize LLM
     llm_generator = LLMGenerator()
     
+    app.llm_queue = asyncio.Queue()
+    app.llm_batch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-batch")
+    app.llm_task = asyncio.create_task(server_loop(app.llm_queue, app.llm_batch_pool))
+    requeued = db_handler.requeue_stale_jobs(0 if WEB_WORKERS == 1 else JOB_STALE_SECONDS)
+    if requeued:
+        logger.info(f"Re-queued {requeued} jobs left running by a stopped worker")
+    app.job_task = asyncio.create_task(job_worker())
+    
     # Initialize story generator
-    story_generator = UniversalStoryGenerator(db_handler, llm_generator)
+    batching_llm = BatchingLLM(llm_generator, asyncio.get_running_loop(), app.llm_queue)
+    story_generator = UniversalStoryGenerator(db_handler, batching_llm)
     
-    # Setup popular universes
-    for universe_name in POPULAR_UNIVERSES:
+    # Setup popular universes that aren't stored yet
+    existing = set(db_handler.get_universe_names())
+    for universe_name in UNIVERSE_KEYS:
+        if universe_name in existing:
+            continue
         try:
             setup_universe(db_handler, universe_name)
         except Exception as e:
@@ -61,13 +302,92 @@ async def startup_event():
     
     logger.info("Universal Fanfiction Generator started successfully!")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the background workers and close pooled database connections"""
+    app.llm_task.cancel()
+    app.job_task.cancel()
+    app.llm_batch_pool.shutdown(wait=False, cancel_futures=True)
+    while not _conn_pool.empty():
+        await _conn_pool.get_nowait().close()
+    db_handler.close()
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Main page"""
-    return templates.TemplateResponse("universal_index.html", {
-        "request": request,
-        "universes": list(POPULAR_UNIVERSES.keys())
-    })
+    return _cached_response(request, index_page, media_type="text/html")
+
+def _ingest_json_corpus(universe: str, upload) -> int:
+    """Stream the stories of an uploaded JSON corpus into the database"""
+    # ijson yields one array element at a time, so only the current
+    # insert batch is ever held in memory; floats rather than Decimals
+    # keep the stories JSON-encodable
+    data = ijson.items(upload, 'item', use_float=True)
+    
+    stories = (
+        {
+            'title': story.get('title', 'Untitled'),
+            'content': story.get('content', ''),
+            'author': story.get('author', ''),
+            'characters': story.get('characters', []),
+            'genre': story.get('genre', ''),
+            'themes': story.get('themes', []),
+            'tags': story.get('tags', [])
+        }
+        for story in data
+    )
+    return db_handler.add_fanfiction_stream(universe, stories)
+
+def _csv_column(header: List[str], name: str, default: str):
+    """Build a getter for one CSV column by position, with a default when absent"""
+    if name not in header:
+        return lambda row: default
+    index = header.index(name)
+    return lambda row: row[index] if index < len(row) else default
+
+def _json_list_cell(value: str) -> str:
+    """Pass a CSV cell through if it holds a JSON array, else an empty one"""
+    # The cell is stored as-is and later unnested by json_each, so anything
+    # malformed would abort the whole upload and a bare string would be
+    # indexed as a character
+    if not value:
+        return '[]'
+    try:
+        return value if isinstance(orjson.loads(value), list) else '[]'
+    except orjson.JSONDecodeError:
+        return '[]'
+
+def _ingest_csv_corpus(universe: str, upload) -> int:
+    """Stream the rows of an uploaded CSV corpus into the database"""
+    # Plain csv.reader rows with positional lookups skip DictReader's per-row
+    # dict, and valid JSON list columns are stored as uploaded instead of
+    # being re-encoded; SQLite parses them when indexing characters
+    reader = csv.reader(codecs.iterdecode(upload, 'utf-8'))
+    header = next(reader, [])
+    title = _csv_column(header, 'title', 'Untitled')
+    content = _csv_column(header, 'content', '')
+    author = _csv_column(header, 'author', '')
+    characters = _csv_column(header, 'characters', '')
+    genre = _csv_column(header, 'genre', '')
+    themes = _csv_column(header, 'themes', '')
+    
+    def to_corpus_row(row: List[str]) -> Tuple:
+        text = content(row)
+        return (
+            universe,
+            title(row),
+            author(row),
+            text,
+            _json_list_cell(characters(row)),
+            genre(row),
+            _json_list_cell(themes(row)),
+            count_words(text),
+            1,
+            '',
+            '[]'
+        )
+    
+    return db_handler.add_fanfiction_rows(map(to_corpus_row, reader))
 
 @app.post("/upload-corpus")
 async def upload_corpus(
@@ -76,68 +396,154 @@ async def upload_corpus(
 ):
     """Upload fanfiction corpus for any universe"""
     try:
-        content = await file.read()
-        
         if file.filename.endswith('.json'):
-            data = json.loads(content.decode('utf-8'))
-            count = 0
+            count = await asyncio.to_thread(_ingest_json_corpus, universe, file.file)
+            _invalidate("corpus-stats", universe)
             
-            for story in data:
-                db_handler.add_fanfiction(
-                    universe=universe,
-                    title=story.get('title', 'Untitled'),
-                    content=story.get('content', ''),
-                    author=story.get('author', ''),
-                    characters=story.get('characters', []),
-                    genre=story.get('genre', ''),
-                    themes=story.get('themes', []),
-                    tags=story.get('tags', [])
-                )
-                count += 1
-            
-            return JSONResponse({
+            return {
                 "status": "success",
                 "message": f"Successfully uploaded {count} stories to {universe} corpus"
-            })
+            }
         
         elif file.filename.endswith('.csv'):
             # Handle CSV upload
-            import csv
-            import io
-            
-            csv_content = content.decode('utf-8')
-            reader = csv.DictReader(io.StringIO(csv_content))
-            count = 0
+            count = await asyncio.to_thread(_ingest_csv_corpus, universe, file.file)
+            _invalidate("corpus-stats", universe)
             
-            for row in reader:
-                db_handler.add_fanfiction(
-                    universe=universe,
-                    title=row.get('title', 'Untitled'),
-                    content=row.get('content', ''),
-                    author=row.get('author', ''),
-                    characters=json.loads(row.get('characters', '[]')) if row.get('characters') else [],
-                    genre=row.get('genre', ''),
-                    themes=json.loads(row.get('themes', '[]')) if row.get('themes') else []
-                )
-                count += 1
-            
-            return JSONResponse({
+            return {
                 "status": "success", 
                 "message": f"Successfully uploaded {count} stories to {universe} corpus"
-            })
+            }
         
         else:
-            return JSONResponse({
+            return {
                 "status": "error",
                 "message": "Unsupported file format. Please use JSON or CSV."
-            })
+            }
     
     except Exception as e:
         logger.error(f"Error uploading corpus: {e}")
-        return JSONResponse({
+        return {
             "status": "error",
             "message": f"Error uploading corpus: {str(e)}"
-        })
+        }
+
+async def _run_create_epic_story(universe: str, story_title: str, main_theme: str, protagonist: str,
+                                 model_type: str = "ollama", model_name: str = "llama3.1:8b") -> Dict:
+    """Generate an epic story structure and describe it for the client"""
+    # The story gets a generator for its own model rather than reconfiguring
+    # the shared one under concurrent requests and jobs. It is built here, not
+    # by the caller, since a queued job can run in a different worker process.
+    llm = await asyncio.to_thread(LLMGenerator, model_type, model_name)
+    generator = UniversalStoryGenerator(
+        db_handler, BatchingLLM(llm, asyncio.get_running_loop(), app.llm_queue)
+    )
+    
+    story, story_id = await asyncio.to_thread(
+        generator.generate_epic_story,
+        universe_name=universe,
+        main_theme=main_theme,
+        protagonist=protagonist,
+        story_title=story_title
+    )
+    _invalidate("get-stories")
+    
+    return {
+        "status": "success",
+        "message": f"Epic story '{story_title}' created successfully!",
+        "story_id": story_id,
+        "story": {
+            "title": story.title,
+            "universe": story.universe,
+            "summary": story.summary,
+            "total_chapters": story.total_chapters,
+            "arcs": [{"number": arc.number, "title": arc.title, "theme": arc.theme} for arc in story.arcs]
+        }
+    }
+
+async def _run_generate_chapters(story_id: int, arc_number: int, start_chapter: int, num_chapters: int) -> Dict:
+    """Generate a run of chapters and summarize them for the client"""
+    chapters = await asyncio.to_thread(
+        story_generator.generate_chapters_for_arc,
+        story_id=story_id,
+        arc_number=arc_number,
+        start_chapter=start_chapter,
+        num_chapters=num_chapters
+    )
+    
+    return {
+        "status": "success",
+        "message": f"Generated {len(chapters)} chapters for Arc {arc_number}",
+        "chapters": [
+            {
+                "number": ch.number,
+                "title": ch.title,
+                "word_count": ch.word_count,
+                "characters": ch.characters_featured,
+                "preview": ch.content[:200] + "..."
+            }
+            for ch in chapters
+        ]
+    }
+
+# Background jobs: the opt-in async_job form field queues a request in the
+# generation_jobs table and returns its id; every web worker runs a
+# job_worker that claims queued jobs one at a time
+JOB_POLL_INTERVAL = 1.0
+# With several workers, a job is only presumed abandoned once it has been
+# 'running' this long; a single worker re-queues all of them at startup
+JOB_STALE_SECONDS = 3600
+_JOB_RUNNERS = {
+    "create-epic-story": _run_create_epic_story,
+    "generate-chapters": _run_generate_chapters,
+}
+
+async def _enqueue_job(kind: str, params: Dict) -> Dict:
+    """Queue a generation request and tell the client where to poll"""
+    job_id = await asyncio.to_thread(db_handler.enqueue_job, kind, params)
+    return {
+        "status": "queued",
+        "job_id": job_id,
+        "message": f"Job {job_id} queued; poll /jobs/{job_id} for the result"
+    }
+
+async def job_worker():
+    """Run queued generation jobs until cancelled"""
+    while True:
+        job = await asyncio.to_thread(db_handler.claim_next_job)
+        if job is None:
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+            continue
+        
+        job_id, kind, params = job
+        try:
+            result = await _JOB_RUNNERS[kind](**params)
+            await asyncio.to_thread(db_handler.finish_job, job_id, result=result)
+        except Exception as e:
+            logger.error(f"Job {job_id} ({kind}) failed: {e}")
+            await asyncio.to_thread(db_handler.finish_job, job_id, error=str(e))
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: int):
+    """Get the status and result of a background job"""
+    try:
+        job = await asyncio.to_thread(db_handler.get_job, job_id)
+        if job:
+            return {
+                "status": "success",
+                "job": job
+            }
+        else:
+            return {
+                "status": "error",
+                "message": "Job not found"
+            }
+    
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error retrieving job: {str(e)}"
+        }
 
 @app.post("/create-epic-story")
 async def create_epic_story(
@@ -146,163 +552,168 @@ async def create_epic_story(
     main_theme: str = Form(...),
     protagonist: str = Form(...),
     model_type: str = Form("ollama"),
-    model_name: str = Form("llama3.1:8b")
+    model_name: str = Form("llama3.1:8b"),
+    async_job: bool = Form(False)
 ):
     """Create a new epic 1000-chapter story structure"""
     try:
-        # Configure LLM
-        llm_generator.configure(model_type, model_name)
-        
-        # Generate epic story structure
-        story, story_id = story_generator.generate_epic_story(
-            universe_name=universe,
-            main_theme=main_theme,
-            protagonist=protagonist,
-            story_title=story_title
-        )
-        
-        return JSONResponse({
-            "status": "success",
-            "message": f"Epic story '{story_title}' created successfully!",
-            "story_id": story_id,
-            "story": {
-                "title": story.title,
-                "universe": story.universe,
-                "summary": story.summary,
-                "total_chapters": story.total_chapters,
-                "arcs": [{"number": arc.number, "title": arc.title, "theme": arc.theme} for arc in story.arcs]
-            }
-        })
+        params = {
+            "universe": universe,
+            "story_title": story_title,
+            "main_theme": main_theme,
+            "protagonist": protagonist,
+            "model_type": model_type,
+            "model_name": model_name
+        }
+        if async_job:
+            return await _enqueue_job("create-epic-story", params)
+        return await _run_create_epic_story(**params)
     
     except Exception as e:
         logger.error(f"Error creating epic story: {e}")
-        return JSONResponse({
+        return {
             "status": "error",
             "message": f"Error creating story: {str(e)}"
-        })
+        }
 
 @app.post("/generate-chapters")
 async def generate_chapters(
     story_id: int = Form(...),
     arc_number: int = Form(...),
     start_chapter: int = Form(1),
-    num_chapters: int = Form(10)
+    num_chapters: int = Form(10),
+    async_job: bool = Form(False)
 ):
     """Generate chapters for a specific arc"""
     try:
-        chapters = story_generator.generate_chapters_for_arc(
-            story_id=story_id,
-            arc_number=arc_number,
-            start_chapter=start_chapter,
-            num_chapters=num_chapters
-        )
-        
-        return JSONResponse({
-            "status": "success",
-            "message": f"Generated {len(chapters)} chapters for Arc {arc_number}",
-            "chapters": [
-                {
-                    "number": ch.number,
-                    "title": ch.title,
-                    "word_count": ch.word_count,
-                    "characters": ch.characters_featured,
-                    "preview": ch.content[:200] + "..."
-                }
-                for ch in chapters
-            ]
-        })
+        params = {
+            "story_id": story_id,
+            "arc_number": arc_number,
+            "start_chapter": start_chapter,
+            "num_chapters": num_chapters
+        }
+        if async_job:
+            return await _enqueue_job("generate-chapters", params)
+        return await _run_generate_chapters(**params)
     
     except Exception as e:
         logger.error(f"Error generating chapters: {e}")
-        return JSONResponse({
+        return {
             "status": "error",
             "message": f"Error generating chapters: {str(e)}"
-        })
+        }
+
+async def _fetch_chapter(story_id: int, chapter_number: int):
+    """Read one chapter row from the database"""
+    async with get_conn() as conn:
+        async with conn.execute(SQL_GET_CHAPTER, (story_id, chapter_number)) as cursor:
+            return await cursor.fetchone()
 
 @app.get("/get-chapter/{story_id}/{chapter_number}")
 async def get_chapter(story_id: int, chapter_number: int):
     """Get full chapter content"""
     try:
-        import sqlite3
-        
-        with sqlite3.connect(db_handler.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT title, content, arc_number, characters_featured, plot_points, word_count, cliffhanger
-                FROM story_chapters 
-                WHERE story_id = ? AND chapter_number = ?
-            ''', (story_id, chapter_number))
-            
-            row = cursor.fetchone()
-            if row:
-                return JSONResponse({
-                    "status": "success",
-                    "chapter": {
-                        "title": row[0],
-                        "content": row[1],
-                        "arc_number": row[2],
-                        "characters_featured": json.loads(row[3]) if row[3] else [],
-                        "plot_points": json.loads(row[4]) if row[4] else [],
-                        "word_count": row[5],
-                        "cliffhanger": row[6]
-                    }
-                })
-            else:
-                return JSONResponse({
-                    "status": "error",
-                    "message": "Chapter not found"
-                })
+        row = await _fetch_chapter(story_id, chapter_number)
+        if row:
+            chapter = ChapterItem(
+                title=row[0],
+                content=row[1],
+                arc_number=row[2],
+                characters_featured=_decode_str_list(row[3]) if row[3] else [],
+                plot_points=_decode_str_list(row[4]) if row[4] else [],
+                word_count=row[5],
+                cliffhanger=row[6]
+            )
+            return Response(
+                _msgspec_encoder.encode(ChapterResponse(status="success", chapter=chapter)),
+                media_type="application/json"
+            )
+        else:
+            return {
+                "status": "error",
+                "message": "Chapter not found"
+            }
     
     except Exception as e:
-        return JSONResponse({
+        return {
             "status": "error",
             "message": f"Error retrieving chapter: {str(e)}"
-        })
+        }
+
+CHAPTER_TEXT_CHUNK = 64 * 1024
+
+async def _fetch_chapter_text(story_id: int, chapter_number: int) -> Optional[bytes]:
+    """Read a chapter's content as UTF-8 bytes"""
+    async with get_conn() as conn:
+        async with conn.execute(SQL_GET_CHAPTER_TEXT, (story_id, chapter_number)) as cursor:
+            row = await cursor.fetchone()
+            return row[0] if row else None
+
+def _iter_chunks(data: bytes, size: int = CHAPTER_TEXT_CHUNK):
+    """Yield a byte string in fixed-size slices"""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+@app.get("/get-chapter-text/{story_id}/{chapter_number}")
+async def get_chapter_text(story_id: int, chapter_number: int):
+    """Stream a chapter's raw text"""
+    try:
+        text = await _fetch_chapter_text(story_id, chapter_number)
+        if text is not None:
+            return StreamingResponse(_iter_chunks(text), media_type="text/plain")
+        else:
+            return {
+                "status": "error",
+                "message": "Chapter not found"
+            }
+    
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error retrieving chapter: {str(e)}"
+        }
+
+async def _fetch_stories() -> List[StoryItem]:
+    """Read all generated stories from the database, newest first"""
+    async with get_conn() as conn:
+        async with conn.execute(SQL_GET_STORIES) as cursor:
+            rows = await cursor.fetchall()
+        
+        # Columns come back in StoryItem field order
+        return [StoryItem(*row) for row in rows]
 
 @app.get("/get-stories")
-async def get_stories():
+async def get_stories(request: Request):
     """Get all generated stories"""
     try:
-        import sqlite3
+        key = ("get-stories",)
+        entry = _response_cache.get(key)
+        if entry is None:
+            generation = _cache_generation
+            stories = await _fetch_stories()
+            entry = _cache_response(key, StoriesResponse(status="success", stories=stories), generation)
         
-        with sqlite3.connect(db_handler.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT id, title, universe, summary, total_chapters, current_chapter, created_at
-                FROM generated_stories
-                ORDER BY created_at DESC
-            ''')
-            
-            stories = []
-            for row in cursor.fetchall():
-                stories.append({
-                    "id": row[0],
-                    "title": row[1],
-                    "universe": row[2],
-                    "summary": row[3],
-                    "total_chapters": row[4],
-                    "current_chapter": row[5],
-                    "created_at": row[6]
-                })
-            
-            return JSONResponse({
-                "status": "success",
-                "stories": stories
-            })
+        return _cached_response(request, entry)
     
     except Exception as e:
-        return JSONResponse({
+        return {
             "status": "error",
             "message": f"Error retrieving stories: {str(e)}"
-        })
+        }
 
 @app.get("/get-universe-info/{universe_name}")
-async def get_universe_info(universe_name: str):
+async def get_universe_info(request: Request, universe_name: str):
     """Get information about a specific universe"""
     try:
-        universe = db_handler.get_universe(universe_name)
+        key = ("get-universe-info", universe_name)
+        entry = _response_cache.get(key)
+        if entry is not None:
+            return _cached_response(request, entry)
+        
+        generation = _cache_generation
+        universe = await asyncio.to_thread(db_handler.get_universe, universe_name)
         if universe:
-            return JSONResponse({
+            entry = _cache_response(key, {
                 "status": "success",
                 "universe": {
                     "name": universe.name,
@@ -314,18 +725,19 @@ async def get_universe_info(universe_name: str):
                     "time_period": universe.time_period,
                     "world_building_elements": universe.world_building_elements
                 }
-            })
+            }, generation)
+            return _cached_response(request, entry)
         else:
-            return JSONResponse({
+            return {
                 "status": "error",
                 "message": "Universe not found"
-            })
+            }
     
     except Exception as e:
-        return JSONResponse({
+        return {
             "status": "error",
             "message": f"Error retrieving universe info: {str(e)}"
-        })
+        }
 
 @app.post("/add-custom-universe")
 async def add_custom_universe(
@@ -345,78 +757,78 @@ async def add_custom_universe(
         universe = Universe(
             name=name,
             genre=genre,
-            main_characters=json.loads(main_characters),
-            locations=json.loads(locations),
-            themes=json.loads(themes),
+            main_characters=orjson.loads(main_characters),
+            locations=orjson.loads(locations),
+            themes=orjson.loads(themes),
             magic_system=magic_system if magic_system else None,
             time_period=time_period if time_period else None,
-            world_building_elements=json.loads(world_building_elements)
+            world_building_elements=orjson.loads(world_building_elements)
         )
         
-        db_handler.add_universe(universe)
+        await asyncio.to_thread(db_handler.add_universe, universe)
+        _invalidate("get-universe-info", name)
         
-        return JSONResponse({
+        return {
             "status": "success",
             "message": f"Custom universe '{name}' added successfully!"
-        })
+        }
     
     except Exception as e:
         logger.error(f"Error adding custom universe: {e}")
-        return JSONResponse({
+        return {
             "status": "error",
             "message": f"Error adding universe: {str(e)}"
-        })
+        }
+
+async def _fetch_corpus_stats(universe_name: str):
+    """Read corpus totals and the most frequent characters for a universe"""
+    async with get_conn() as conn:
+        # Get basic stats
+        async with conn.execute(SQL_CORPUS_TOTALS, (universe_name,)) as cursor:
+            basic_stats = await cursor.fetchone()
+        
+        # Get character frequency
+        async with conn.execute(SQL_TOP_CHARACTERS, (universe_name,)) as cursor:
+            return basic_stats, await cursor.fetchall()
 
 @app.get("/corpus-stats/{universe_name}")
-async def get_corpus_stats(universe_name: str):
+async def get_corpus_stats(request: Request, universe_name: str):
     """Get statistics about the corpus for a universe"""
     try:
-        import sqlite3
-        
-        with sqlite3.connect(db_handler.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Get basic stats
-            cursor.execute('''
-                SELECT COUNT(*), AVG(word_count), SUM(word_count)
-                FROM fanfiction_corpus 
-                WHERE universe = ?
-            ''', (universe_name,))
-            
-            basic_stats = cursor.fetchone()
-            
-            # Get character frequency
-            cursor.execute('''
-                SELECT characters FROM fanfiction_corpus 
-                WHERE universe = ? AND characters IS NOT NULL
-            ''', (universe_name,))
-            
-            character_counts = {}
-            for row in cursor.fetchall():
-                chars = json.loads(row[0]) if row[0] else []
-                for char in chars:
-                    character_counts[char] = character_counts.get(char, 0) + 1
-            
-            return JSONResponse({
+        key = ("corpus-stats", universe_name)
+        entry = _response_cache.get(key)
+        if entry is None:
+            generation = _cache_generation
+            basic_stats, top_characters = await _fetch_corpus_stats(universe_name)
+            entry = _cache_response(key, {
                 "status": "success",
                 "stats": {
                     "total_stories": basic_stats[0] or 0,
                     "average_word_count": round(basic_stats[1] or 0),
                     "total_words": basic_stats[2] or 0,
-                    "top_characters": sorted(character_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+                    "top_characters": top_characters
                 }
-            })
+            }, generation)
+        
+        return _cached_response(request, entry)
     
     except Exception as e:
-        return JSONResponse({
+        return {
             "status": "error",
             "message": f"Error getting corpus stats: {str(e)}"
-        })
+        }
 
-if __name__ == "__main__":
+def serve(host: str = "0.0.0.0", port: int = 12000):
+    """Run the app under uvicorn with pre-forked workers, uvloop and httptools"""
     uvicorn.run(
         "universal_web_interface:app",
-        host="0.0.0.0",
-        port=12000,
-        reload=True
-    )
\ No newline at end of file
+        host=host,
+        port=port,
+        workers=WEB_WORKERS,
+        loop="uvloop",
+        http="httptools",
+        log_level="info"
+    )
+
+if __name__ == "__main__":
+    serve()
\ No newline at end of file
@@ -1,37 +1,132 @@
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import uvicorn
-import json
+import aiofiles
+import asyncio
+import itertools
+import orjson
+import zstandard
 import os
-from typing import List, Dict, Any, Optional
+import logging
+from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 from pathlib import Path
+from functools import lru_cache
 
 from database_handler import DatabaseHandler, CSVHandler, JSONHandler
 from text_analyzer import TextAnalyzer, CorpusAnalyzer
-from llm_generator import LLMGenerator, FanfictionGenerator
+from llm_generator import LLMGenerator, FanfictionGenerator, create_async_http_client
 from config import Config
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="Harry Potter Fanfiction Generator", version="1.0.0")
 
 # Create directories
 os.makedirs("static", exist_ok=True)
 os.makedirs("templates", exist_ok=True)
 os.makedirs("uploads", exist_ok=True)
+os.makedirs("uploads/snapshots", exist_ok=True)
 os.makedirs("generated", exist_ok=True)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Single-line JSON for stories, corpus .meta.json files and Server-Sent
+# Events; numpy values from the corpus analysis serialize natively
+COMPACT_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Stories are saved zstd-compressed; plain .json files from before are
+# still listed and served
+STORY_ZSTD_LEVEL = 3
+STORY_SUFFIXES = ('.json.zst', '.json')
+
+def _story_id_from_name(name: str) -> Optional[str]:
+    """Story id from a story_<id>.json[.zst] file name, or None"""
+    if name.startswith("story_"):
+        for suffix in STORY_SUFFIXES:
+            if name.endswith(suffix):
+                return name[len("story_"):-len(suffix)]
+    return None
+
+def _read_story(path: str) -> Dict[str, Any]:
+    """Load a saved story, decompressing it if needed"""
+    data = Path(path).read_bytes()
+    if path.endswith('.zst'):
+        data = zstandard.decompress(data)
+    return orjson.loads(data)
+
 # Global variables for the application state
 db_handler = None
 text_analyzer = TextAnalyzer()
 corpus_analyzer = CorpusAnalyzer(text_analyzer)
 corpus_analysis = {}
+corpus_column_stats = {}
 current_df = pd.DataFrame()
 
+# Story ids continue from the highest saved story. Drawing an id never
+# awaits, so concurrent requests on the event loop can't get the same one.
+_next_story_id = itertools.count(max(
+    (int(story_id) for story_id in map(_story_id_from_name, os.listdir("generated"))
+     if story_id and story_id.isdigit()),
+    default=0
+) + 1)
+
+# /stories summaries keyed by file path, with the st_mtime_ns they were read at
+_stories_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+# Parsed corpora are kept as Parquet plus a .meta.json holding the corpus
+# analysis, so a restart doesn't re-parse the source. Both are named after
+# the full upload name (novels.csv -> novels.csv.parquet) so uploads
+# differing only by extension don't overwrite each other, and live in their
+# own directory so a raw .parquet upload is never restored as a corpus.
+SNAPSHOT_DIR = Path("uploads/snapshots")
+
+def _persist_corpus(upload_path: Path, df: pd.DataFrame, analysis: Dict[str, Any]):
+    """Save the parsed corpus as Parquet and its analysis as .meta.json"""
+    try:
+        df.to_parquet(SNAPSHOT_DIR / (upload_path.name + '.parquet'), compression='zstd')
+        (SNAPSHOT_DIR / (upload_path.name + '.meta.json')).write_bytes(
+            orjson.dumps(analysis, option=COMPACT_JSON_OPTIONS))
+    except Exception as e:
+        logger.warning(f"Could not persist corpus {upload_path}: {e}")
+
+@app.on_event("startup")
+async def open_http_client():
+    """Open the keep-alive client every LLM request goes through"""
+    app.state.http = create_async_http_client()
+
+@app.on_event("shutdown")
+async def close_http_client():
+    """Close the shared LLM client"""
+    await app.state.http.aclose()
+
+@app.on_event("startup")
+async def load_persisted_corpus():
+    """Restore the most recently uploaded corpus from its Parquet copy"""
+    global current_df, corpus_analysis, corpus_column_stats
+    
+    parquet_files = sorted(SNAPSHOT_DIR.glob("*.parquet"), key=lambda p: p.stat().st_mtime)
+    if not parquet_files:
+        return
+    
+    latest = parquet_files[-1]
+    try:
+        current_df = pd.read_parquet(latest, engine='pyarrow', memory_map=True, dtype_backend='pyarrow')
+        meta_file = latest.with_name(latest.name[:-len('.parquet')] + '.meta.json')
+        corpus_analysis = orjson.loads(meta_file.read_bytes()) if meta_file.exists() else {}
+        corpus_column_stats = _compute_column_stats(current_df)
+        logger.info(f"Restored {len(current_df)} novels from {latest}")
+    except Exception as e:
+        logger.warning(f"Could not restore corpus from {latest}: {e}")
+        current_df = pd.DataFrame()
+        corpus_analysis = {}
+        corpus_column_stats = {}
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Home page"""
@@ -44,16 +139,16 @@ async def home(request: Request):
 @app.post("/upload-database")
 async def upload_database(file: UploadFile = File(...)):
     """Upload and analyze database"""
-    global db_handler, current_df, corpus_analysis
+    global db_handler, current_df, corpus_analysis, corpus_column_stats
     
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file selected")
     
-    # Save uploaded file
+    # Save uploaded file, one chunk at a time so memory stays flat
     file_path = f"uploads/{file.filename}"
-    with open(file_path, "wb") as buffer:
-        content = await file.read()
-        buffer.write(content)
+    async with aiofiles.open(file_path, "wb") as buffer:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
     
     try:
         # Handle different file types
@@ -74,22 +169,23 @@ async def upload_database(file: UploadFile = File(...)):
         else:
             raise HTTPException(status_code=400, detail="Unsupported file format")
         
+        # The corpus only changes on upload, so summarize its columns once here
+        corpus_column_stats = _compute_column_stats(current_df)
+        
         # Analyze corpus if we have text data
         if not current_df.empty:
-            # Try to find text column
+            # Try to find text column, in order of preference
             text_columns = ['content', 'text', 'story', 'body', 'novel']
-            text_column = None
-            
-            for col in text_columns:
-                if col in current_df.columns:
-                    text_column = col
-                    break
+            available = set(current_df.columns)
+            text_column = next((col for col in text_columns if col in available), None)
             
             if text_column:
                 corpus_analysis = corpus_analyzer.analyze_corpus(current_df, text_column)
             else:
                 corpus_analysis = {"error": "No text column found"}
         
+        await asyncio.to_thread(_persist_corpus, Path(file_path), current_df, corpus_analysis)
+        
         return {
             "status": "success",
             "message": f"Database uploaded successfully. Found {len(current_df)} novels.",
@@ -122,16 +218,20 @@ async def generate_story(
     theme: str = Form(...),
     target_length: int = Form(5000),
     model_type: str = Form("openai"),
-    model_name: str = Form("gpt-3.5-turbo")
+    model_name: str = Form("gpt-3.5-turbo"),
+    stream: bool = Form(False)
 ):
-    """Generate a new fanfiction story"""
+    """Generate a new fanfiction story, optionally streamed as Server-Sent Events"""
     
     if current_df.empty:
         raise HTTPException(status_code=400, detail="No database loaded. Please upload your fanfiction database first.")
     
     try:
-        # Initialize LLM generator
-        llm_generator = LLMGenerator(model_type=model_type, model_name=model_name)
+        # Initialize LLM generator; the Ollama connection check is blocking, so
+        # keep it off the event loop
+        llm_generator = await asyncio.to_thread(
+            LLMGenerator, model_type=model_type, model_name=model_name, http_client=app.state.http
+        )
         fanfic_generator = FanfictionGenerator(llm_generator, corpus_analysis)
         
         # Set generation parameters
@@ -143,15 +243,15 @@ async def generate_story(
             'target_length': target_length
         }
         
+        if stream:
+            return StreamingResponse(_stream_story_events(fanfic_generator, parameters),
+                                     media_type="text/event-stream")
+        
         # Generate the story
-        story = fanfic_generator.generate_full_story(parameters)
+        story = await fanfic_generator.generate_full_story_async(parameters)
         
         # Save generated story
-        story_id = len(os.listdir("generated")) + 1
-        story_file = f"generated/story_{story_id}.json"
-        
-        with open(story_file, 'w', encoding='utf-8') as f:
-            json.dump(story, f, indent=2, ensure_ascii=False)
+        story_id, story_file = await _save_story(story)
         
         return {
             "status": "success",
@@ -163,44 +263,108 @@ async def generate_story(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating story: {str(e)}")
 
+async def _save_story(story: Dict[str, Any]) -> Tuple[int, str]:
+    """Write a generated story to generated/ and return its id and path"""
+    story_id = next(_next_story_id)
+    story_file = f"generated/story_{story_id}.json.zst"
+    
+    async with aiofiles.open(story_file, 'wb') as f:
+        await f.write(zstandard.compress(orjson.dumps(story, option=COMPACT_JSON_OPTIONS), STORY_ZSTD_LEVEL))
+    _stories_cache.pop(story_file, None)
+    
+    return story_id, story_file
+
+def _sse_event(event: str, data: Any) -> bytes:
+    """Encode one Server-Sent Event"""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data, option=COMPACT_JSON_OPTIONS) + b"\n\n"
+
+async def _stream_story_events(fanfic_generator: FanfictionGenerator, parameters: Dict[str, Any]):
+    """Relay story generation as SSE, saving the story once it is complete"""
+    try:
+        async for event, data in fanfic_generator.stream_full_story(parameters):
+            if event == 'story':
+                story_id, _ = await _save_story(data)
+                data = {"story_id": story_id, "story": data}
+            yield _sse_event(event, data)
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        yield _sse_event("error", {"detail": f"Error generating story: {str(e)}"})
+
+@lru_cache(maxsize=4096)
+def _analyze_text_cached(text: str) -> Dict[str, Any]:
+    """Run the full text analysis; results depend only on the text"""
+    return {
+        'basic_stats': text_analyzer.extract_basic_stats(text),
+        'characters': text_analyzer.extract_characters(text, Config.MAIN_CHARACTERS),
+        'locations': text_analyzer.extract_locations(text, Config.LOCATIONS),
+        'magical_elements': text_analyzer.extract_magical_elements(text, Config.MAGICAL_ELEMENTS),
+        'sentiment': text_analyzer.analyze_sentiment(text),
+        'writing_style': text_analyzer.analyze_writing_style(text)
+    }
+
 @app.get("/analyze-text")
 async def analyze_text(text: str):
     """Analyze a piece of text"""
     try:
-        analysis = {
-            'basic_stats': text_analyzer.extract_basic_stats(text),
-            'characters': text_analyzer.extract_characters(text, Config.MAIN_CHARACTERS),
-            'locations': text_analyzer.extract_locations(text, Config.LOCATIONS),
-            'magical_elements': text_analyzer.extract_magical_elements(text, Config.MAGICAL_ELEMENTS),
-            'sentiment': text_analyzer.analyze_sentiment(text),
-            'writing_style': text_analyzer.analyze_writing_style(text)
-        }
+        analysis = _analyze_text_cached(text)
         
         return {"status": "success", "analysis": analysis}
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing text: {str(e)}")
 
+def _summarize_story(story_file: Path, story_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the /stories listing entry for one story file"""
+    return {
+        'id': _story_id_from_name(story_file.name),
+        'title': story_data.get('title', 'Untitled'),
+        'summary': story_data.get('summary', '')[:200] + '...',
+        'chapter_count': len(story_data.get('chapters', [])),
+        'word_count': story_data.get('metadata', {}).get('estimated_word_count', 0),
+        'file': str(story_file)
+    }
+
 @app.get("/stories")
 async def list_generated_stories():
     """List all generated stories"""
     try:
         stories = []
-        generated_dir = Path("generated")
         
-        if generated_dir.exists():
-            for story_file in generated_dir.glob("story_*.json"):
-                with open(story_file, 'r', encoding='utf-8') as f:
-                    story_data = json.load(f)
-                
-                stories.append({
-                    'id': story_file.stem.split('_')[1],
-                    'title': story_data.get('title', 'Untitled'),
-                    'summary': story_data.get('summary', '')[:200] + '...',
-                    'chapter_count': len(story_data.get('chapters', [])),
-                    'word_count': story_data.get('metadata', {}).get('estimated_word_count', 0),
-                    'file': str(story_file)
-                })
+        if os.path.isdir("generated"):
+            mtimes = {}
+            for entry in os.scandir("generated"):
+                if _story_id_from_name(entry.name) is None:
+                    continue
+                try:
+                    mtimes[entry.path] = entry.stat().st_mtime_ns
+                except FileNotFoundError:  # deleted since the directory was listed
+                    continue
+            
+            # Work from a local snapshot: other requests may update or prune
+            # the shared cache while this one awaits the file reads
+            summaries = {}
+            for path, mtime in mtimes.items():
+                cached = _stories_cache.get(path)
+                if cached is not None and cached[0] == mtime:
+                    summaries[path] = cached[1]
+            
+            # Only re-read files that are new or changed since they were cached,
+            # concurrently and off the event loop
+            stale = [path for path in mtimes if path not in summaries]
+            loaded = await asyncio.gather(*(asyncio.to_thread(_read_story, path) for path in stale),
+                                          return_exceptions=True)
+            for path, story_data in zip(stale, loaded):
+                if isinstance(story_data, FileNotFoundError):
+                    continue
+                if isinstance(story_data, BaseException):
+                    raise story_data
+                summaries[path] = _summarize_story(Path(path), story_data)
+                _stories_cache[path] = (mtimes[path], summaries[path])
+            
+            for path in _stories_cache.keys() - mtimes.keys():
+                _stories_cache.pop(path, None)
+            
+            stories = [summaries[path] for path in mtimes if path in summaries]
         
         return {"status": "success", "stories": stories}
         
@@ -211,19 +375,51 @@ async def list_generated_stories():
 async def get_story(story_id: str):
     """Get a specific generated story"""
     try:
-        story_file = f"generated/story_{story_id}.json"
+        story_file = next((f"generated/story_{story_id}{suffix}" for suffix in STORY_SUFFIXES
+                           if os.path.exists(f"generated/story_{story_id}{suffix}")), None)
         
-        if not os.path.exists(story_file):
+        if not story_file:
             raise HTTPException(status_code=404, detail="Story not found")
         
-        with open(story_file, 'r', encoding='utf-8') as f:
-            story = json.load(f)
+        story = await asyncio.to_thread(_read_story, story_file)
         
         return {"status": "success", "story": story}
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving story: {str(e)}")
 
+def _compute_column_stats(df: pd.DataFrame) -> Dict[str, Any]:
+    """Summarize each text and numeric column of the corpus"""
+    # Split the columns by dtype once and aggregate each block as a whole;
+    # Arrow-backed columns are selected by their numpy equivalents, which is
+    # a str dtype for Arrow strings
+    text = df.select_dtypes(include=['object', 'string'])
+    numeric = df.select_dtypes(include=['number', 'bool'])
+    
+    null_counts = df.isna().sum().to_dict()
+    unique_counts = text.nunique().to_dict()
+    num_stats = numeric.agg(['mean', 'min', 'max']).to_dict() if not numeric.columns.empty else {}
+    
+    def number(value):
+        return None if pd.isna(value) else float(value)
+    
+    stats = {}
+    for col in df.columns:
+        if col in unique_counts:  # Text columns
+            stats[f"{col}_stats"] = {
+                "unique_values": int(unique_counts[col]),
+                "null_count": int(null_counts[col]),
+                "sample_values": text[col].dropna().head(5).tolist()
+            }
+        elif col in num_stats:  # Numeric columns
+            stats[f"{col}_stats"] = {
+                "mean": number(num_stats[col]['mean']),
+                "min": number(num_stats[col]['min']),
+                "max": number(num_stats[col]['max']),
+                "null_count": int(null_counts[col])
+            }
+    return stats
+
 @app.get("/corpus-stats")
 async def get_corpus_statistics():
     """Get detailed corpus statistics"""
@@ -231,29 +427,14 @@ async def get_corpus_statistics():
         return {"status": "no_data", "message": "No corpus loaded"}
     
     try:
-        # Basic statistics
+        # Basic statistics plus the column summaries computed at upload
         stats = {
             "total_novels": len(current_df),
             "columns": list(current_df.columns),
-            "corpus_analysis": corpus_analysis
+            "corpus_analysis": corpus_analysis,
+            **corpus_column_stats
         }
         
-        # Add column-specific statistics
-        for col in current_df.columns:
-            if current_df[col].dtype == 'object':  # Text columns
-                stats[f"{col}_stats"] = {
-                    "unique_values": current_df[col].nunique(),
-                    "null_count": current_df[col].isnull().sum(),
-                    "sample_values": current_df[col].dropna().head(5).tolist()
-                }
-            elif pd.api.types.is_numeric_dtype(current_df[col]):  # Numeric columns
-                stats[f"{col}_stats"] = {
-                    "mean": float(current_df[col].mean()) if not current_df[col].isnull().all() else None,
-                    "min": float(current_df[col].min()) if not current_df[col].isnull().all() else None,
-                    "max": float(current_df[col].max()) if not current_df[col].isnull().all() else None,
-                    "null_count": current_df[col].isnull().sum()
-                }
-        
         return {"status": "success", "statistics": stats}
         
     except Exception as e:
@@ -3,15 +3,19 @@
 Working fanfiction generator using extracted chapters and Ollama
 """
 
-import json
+import asyncio
+import aiofiles
+import ijson
+import orjson
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Any
 import logging
 import os
-import requests
+import httpx
+from pathlib import Path
 from text_analyzer import TextAnalyzer, CorpusAnalyzer
-from llm_generator import LLMGenerator, FanfictionGenerator
+from llm_generator import LLMGenerator, FanfictionGenerator, create_async_http_client
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,44 +26,50 @@ class WorkingFanficGenerator:
         self.text_analyzer = TextAnalyzer()
         self.corpus_analyzer = CorpusAnalyzer(self.text_analyzer)
         
-    def load_chapters(self) -> pd.DataFrame:
-        """Load chapters from extracted JSON file"""
+    def load_chapters(self) -> List[Dict[str, Any]]:
+        """Load chapters from an extracted JSON array or JSON Lines file"""
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                chapters = json.load(f)
+            # Parse one chapter at a time so the raw file is never held in
+            # memory alongside the parsed objects
+            with open(self.data_file, 'rb') as f:
+                if self.data_file.endswith('.jsonl'):
+                    chapters = [orjson.loads(line) for line in f if line.strip()]
+                else:
+                    chapters = list(ijson.items(f, 'item', use_float=True))
             
-            df = pd.DataFrame(chapters)
-            logger.info(f"Loaded {len(df)} chapters from {self.data_file}")
-            return df
+            logger.info(f"Loaded {len(chapters)} chapters from {self.data_file}")
+            return chapters
             
         except Exception as e:
             logger.error(f"Error loading chapters: {e}")
-            return pd.DataFrame()
+            return []
     
     def analyze_corpus(self) -> Dict[str, Any]:
         """Analyze the extracted chapters"""
         print("📊 Analyzing your Harry Potter fanfiction corpus...")
         
         # Load chapters
-        df = self.load_chapters()
+        chapters = self.load_chapters()
         
-        if df.empty:
+        if not chapters:
             print("❌ No chapters could be loaded")
             return {}
         
-        print(f"✅ Loaded {len(df)} chapters for analysis")
+        print(f"✅ Loaded {len(chapters)} chapters for analysis")
         
         # Show sample data
         print("\n📖 Sample chapters from your database:")
-        for idx, row in df.head(3).iterrows():
-            print(f"  Chapter {row['id']}: {row['title']}")
-            print(f"    Novel ID: {row['novel_id']}")
-            print(f"    Content length: {len(row['content'])} chars")
-            print(f"    Preview: {row['content'][:100].strip()}...")
+        for chapter in chapters[:3]:
+            print(f"  Chapter {chapter['id']}: {chapter['title']}")
+            print(f"    Novel ID: {chapter['novel_id']}")
+            print(f"    Content length: {len(chapter['content'])} chars")
+            print(f"    Preview: {chapter['content'][:100].strip()}...")
             print()
         
-        # Analyze corpus
+        # Analyze corpus; the analyzer works on a DataFrame, so build it once
+        # here with a fixed set of columns
         try:
+            df = pd.DataFrame.from_records(chapters, columns=['id', 'novel_id', 'title', 'content'])
             corpus_analysis = self.corpus_analyzer.analyze_corpus(df, 'content')
             
             print("✅ Corpus analysis complete!")
@@ -104,12 +114,12 @@ class WorkingFanficGenerator:
             logger.error(f"Error during analysis: {e}")
             return {}
     
-    def test_ollama(self) -> tuple[bool, str]:
+    async def test_ollama(self, client: httpx.AsyncClient) -> tuple[bool, str]:
         """Test Ollama connection and available models"""
         print("\n🤖 Testing Ollama connection...")
         
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=5)
+            response = await client.get("http://localhost:11434/api/tags", timeout=5)
             if response.status_code == 200:
                 models = response.json().get('models', [])
                 model_names = [model['name'] for model in models]
@@ -132,13 +142,14 @@ class WorkingFanficGenerator:
         except Exception as e:
             return False, str(e)
     
-    def generate_story(self, corpus_analysis: Dict[str, Any], model_name: str) -> Dict[str, Any]:
+    async def generate_story(self, corpus_analysis: Dict[str, Any], model_name: str,
+                             client: httpx.AsyncClient) -> Dict[str, Any]:
         """Generate a story using Ollama"""
         print(f"\n✨ Generating Harry Potter fanfiction...")
         print(f"🤖 Using model: {model_name}")
         
         # Initialize generator
-        llm_generator = LLMGenerator(model_type="ollama", model_name=model_name)
+        llm_generator = LLMGenerator(model_type="ollama", model_name=model_name, http_client=client)
         fanfic_generator = FanfictionGenerator(llm_generator, corpus_analysis)
         
         # Generation parameters based on your corpus
@@ -157,14 +168,19 @@ class WorkingFanficGenerator:
         try:
             # Generate story
             print(f"\n⏳ Generating story... (this may take a minute)")
-            story = fanfic_generator.generate_full_story(parameters)
+            story = await fanfic_generator.generate_full_story_async(parameters)
             
             # Save story
             os.makedirs("generated", exist_ok=True)
-            story_file = f"generated/hp_fanfic_{len(os.listdir('generated')) + 1}.json"
+            story_number = max(
+                (int(p.stem.rsplit('_', 1)[1]) for p in Path("generated").glob("hp_fanfic_*.json")
+                 if p.stem.rsplit('_', 1)[1].isdigit()),
+                default=0
+            ) + 1
+            story_file = f"generated/hp_fanfic_{story_number}.json"
             
-            with open(story_file, 'w', encoding='utf-8') as f:
-                json.dump(story, f, indent=2, ensure_ascii=False)
+            async with aiofiles.open(story_file, 'wb') as f:
+                await f.write(orjson.dumps(story, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
             
             print(f"✅ Story generated and saved to: {story_file}")
             return story
@@ -207,7 +223,7 @@ class WorkingFanficGenerator:
         
         print(f"\n💾 Full story saved in JSON format for further use.")
 
-def main():
+async def main():
     """Main function"""
     print("🪄 HARRY POTTER FANFICTION GENERATOR")
     print("Using your extracted novel database with Ollama/Llama 3.1")
@@ -223,20 +239,21 @@ def main():
         print("❌ Could not analyze corpus. Exiting.")
         return
     
-    # Step 2: Test Ollama
-    ollama_available, model_info = generator.test_ollama()
-    
-    if ollama_available:
-        # Step 3: Generate story
-        story = generator.generate_story(corpus_analysis, model_info)
+    async with create_async_http_client() as client:
+        # Step 2: Test Ollama
+        ollama_available, model_info = await generator.test_ollama(client)
         
-        if story:
-            # Step 4: Display results
-            generator.display_story(story)
-        else:
-            print("❌ Story generation failed")
+        if ollama_available:
+            # Step 3: Generate story
+            story = await generator.generate_story(corpus_analysis, model_info, client)
+            
+            if story:
+                # Step 4: Display results
+                generator.display_story(story)
+            else:
+                print("❌ Story generation failed")
     
-    else:
+    if not ollama_available:
         print(f"❌ Ollama not available: {model_info}")
         print("\n💡 To use Ollama with Llama 3.1:")
         print("1. Install Ollama: https://ollama.ai/")
@@ -263,4 +280,4 @@ def main():
             generator.display_story(story)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file